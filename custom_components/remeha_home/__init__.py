@@ -1,25 +1,97 @@
 """The Remeha Home integration."""
 
 from __future__ import annotations
+import asyncio
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
 
+import voluptuous as vol
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_entry_oauth2_flow, entity_registry as er
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 
 from .api import RemehaHomeOAuth2Implementation, RemehaHomeAPI
+from .backfill import RemehaHomeEnergyBackfill
+from .climate import ZONE_SCENE_SCHEMA, zone_scene_command
 from .config_flow import RemehaHomeLoginFlowHandler
-from .const import DOMAIN
+from .const import (
+    ATTR_CYCLES,
+    ATTR_ZONES,
+    BACKFILL_INTERVAL,
+    CONF_CONDITIONAL_DASHBOARD,
+    CONF_CONSUMPTION_UPDATE_INTERVAL,
+    CONF_ENERGY_BACKFILL,
+    CONF_MAX_PARALLEL_REQUESTS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_TECHNICAL_INFO_UPDATE_INTERVAL,
+    CONF_TOKEN_REFRESH_MARGIN,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_CONDITIONAL_DASHBOARD,
+    DEFAULT_CONSUMPTION_UPDATE_INTERVAL,
+    DEFAULT_ENERGY_BACKFILL,
+    DEFAULT_MAX_PARALLEL_REQUESTS,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL,
+    DEFAULT_TOKEN_REFRESH_MARGIN,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    MAX_PROFILE_CYCLES,
+    SERVICE_APPLY_SCENE,
+    SERVICE_CAPTURE_PROFILE,
+    STORAGE_KEY_DASHBOARD,
+    STORAGE_KEY_ENERGY_BACKFILL,
+    STORAGE_KEY_SCHEDULES,
+    STORAGE_KEY_TECHNICAL_INFO,
+    STORAGE_VERSION,
+)
 from .coordinator import RemehaHomeUpdateCoordinator
+from .profiling import async_capture_profile, write_profile_report
+from .traffic import TrafficRecorder
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
+    Platform.CALENDAR,
     Platform.CLIMATE,
     Platform.SENSOR,
     Platform.SWITCH,
+    Platform.WATER_HEATER,
 ]
 
+CAPTURE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+    }
+)
+
+APPLY_SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ZONES): vol.All(
+            {cv.entity_id: ZONE_SCENE_SCHEMA}, vol.Length(min=1)
+        ),
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up Remeha Home."""
@@ -30,6 +102,97 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         RemehaHomeOAuth2Implementation(async_get_clientsession(hass)),
     )
 
+    async def _async_capture_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile refresh cycles of every config entry and write the reports."""
+        reports = {}
+        for entry_id, entry_data in hass.data[DOMAIN].items():
+            latencies, spans, profiler, snapshots = await async_capture_profile(
+                entry_data["coordinator"], call.data[ATTR_CYCLES]
+            )
+            report_path, stats_path = await hass.async_add_executor_job(
+                write_profile_report,
+                Path(hass.config.path(DOMAIN)),
+                entry_id,
+                latencies,
+                spans,
+                profiler,
+                snapshots,
+            )
+            reports[entry_id] = {
+                "report": str(report_path),
+                "profile": str(stats_path),
+                "latencies": [round(latency, 4) for latency in latencies],
+                "spans": spans.as_dict(),
+            }
+        return {"reports": reports}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE_PROFILE,
+        _async_capture_profile,
+        schema=CAPTURE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_apply_scene(call: ServiceCall) -> ServiceResponse:
+        """Apply modes and setpoints to climate zones and verify them once."""
+        entity_registry = er.async_get(hass)
+        zones = []
+        for entity_id, scene in call.data[ATTR_ZONES].items():
+            entity_entry = entity_registry.async_get(entity_id)
+            if (
+                entity_entry is None
+                or entity_entry.platform != DOMAIN
+                or entity_entry.domain != CLIMATE_DOMAIN
+                or (entry_data := hass.data[DOMAIN].get(entity_entry.config_entry_id))
+                is None
+                or (
+                    climate_zone := entry_data["coordinator"].get_by_id(
+                        entity_entry.unique_id.removeprefix(f"{DOMAIN}_")
+                    )
+                )
+                is None
+            ):
+                raise ServiceValidationError(
+                    f"{entity_id} is not a loaded Remeha Home climate zone"
+                )
+            zones.append((entity_id, entity_entry.config_entry_id, climate_zone, scene))
+
+        # The commands are only created after every zone was found, so none of
+        # them is left unawaited
+        commands = defaultdict(dict)
+        entity_ids = {}
+        for entity_id, entry_id, climate_zone, scene in zones:
+            climate_zone_id = climate_zone.climate_zone_id
+            commands[entry_id][climate_zone_id] = zone_scene_command(
+                hass.data[DOMAIN][entry_id]["api"], climate_zone, scene
+            )
+            entity_ids[climate_zone_id] = entity_id
+
+        outcomes = await asyncio.gather(
+            *(
+                hass.data[DOMAIN][entry_id]["coordinator"].async_send_commands(
+                    entry_commands
+                )
+                for entry_id, entry_commands in commands.items()
+            )
+        )
+        return {
+            "zones": {
+                entity_ids[climate_zone_id]: result
+                for outcome in outcomes
+                for climate_zone_id, result in outcome.items()
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SCENE,
+        _async_apply_scene,
+        schema=APPLY_SCENE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
@@ -42,24 +205,156 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     )
 
     oauth_session = config_entry_oauth2_flow.OAuth2Session(hass, entry, implementation)
-    api = RemehaHomeAPI(oauth_session)
-    coordinator = RemehaHomeUpdateCoordinator(hass, api)
+    api = RemehaHomeAPI(oauth_session, session=async_get_clientsession(hass))
+    if entry.options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+        api.recorder = TrafficRecorder(
+            Path(hass.config.path(DOMAIN, f"traffic_{entry.entry_id}.jsonl"))
+        )
+        await hass.async_add_executor_job(api.recorder.start)
+
+        async def _async_stop_recorder() -> None:
+            await hass.async_add_executor_job(api.recorder.stop)
+
+        entry.async_on_unload(_async_stop_recorder)
+    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    coordinator = RemehaHomeUpdateCoordinator(
+        hass,
+        entry,
+        api,
+        max_parallel_requests=entry.options.get(
+            CONF_MAX_PARALLEL_REQUESTS, DEFAULT_MAX_PARALLEL_REQUESTS
+        ),
+        conditional_dashboard=entry.options.get(
+            CONF_CONDITIONAL_DASHBOARD, DEFAULT_CONDITIONAL_DASHBOARD
+        ),
+        update_interval=timedelta(seconds=update_interval),
+        min_update_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+            )
+        ),
+        max_update_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+            )
+        ),
+        consumption_update_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_CONSUMPTION_UPDATE_INTERVAL, DEFAULT_CONSUMPTION_UPDATE_INTERVAL
+            )
+        ),
+        technical_info_update_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_TECHNICAL_INFO_UPDATE_INTERVAL,
+                DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL,
+            )
+        ),
+        poll_offset=_poll_offset(hass, entry, update_interval),
+    )
+
+    if await coordinator.async_load_cache():
+        # Set up the entities from the last known dashboard and update it in the
+        # background, so a slow or unavailable API does not delay startup. The
+        # update waits for the poll offset, so accounts do not start together.
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_after_poll_offset(),
+            f"{DOMAIN} first refresh",
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
-    await coordinator.async_config_entry_first_refresh()
+    backfill = None
+    if entry.options.get(CONF_ENERGY_BACKFILL, DEFAULT_ENERGY_BACKFILL):
+        backfill = RemehaHomeEnergyBackfill(hass, entry, api, coordinator)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "backfill": backfill,
+        # Only changes of these options reload the entry, not token updates
+        "options": dict(entry.options),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Revalidate technical information that was cached during a previous run
+    entry.async_create_background_task(
+        hass,
+        coordinator.technical_info_coordinator.async_refresh(),
+        f"{DOMAIN} technical information refresh",
+    )
+    entry.async_on_unload(coordinator.async_shutdown)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    entry.async_create_background_task(
+        hass,
+        api.async_refresh_token_ahead_of_expiry(
+            entry.options.get(CONF_TOKEN_REFRESH_MARGIN, DEFAULT_TOKEN_REFRESH_MARGIN)
+        ),
+        f"{DOMAIN} token refresh",
+    )
+
+    if backfill is not None:
+        entry.async_create_background_task(
+            hass, backfill.async_run(), f"{DOMAIN} energy backfill"
+        )
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, backfill.async_run, timedelta(seconds=BACKFILL_INTERVAL)
+            )
+        )
+
     return True
 
 
+def _poll_offset(
+    hass: HomeAssistant, entry: ConfigEntry, update_interval: int
+) -> timedelta:
+    """Return the offset of the first update of a config entry.
+
+    The config entries are spread evenly over the update interval, so multiple
+    accounts do not request the API at the same time.
+    """
+    entry_ids = sorted(
+        config_entry.entry_id
+        for config_entry in hass.config_entries.async_entries(DOMAIN)
+    )
+    if entry.entry_id not in entry_ids:
+        return timedelta(0)
+    return timedelta(
+        seconds=entry_ids.index(entry.entry_id) * update_interval / len(entry_ids)
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed.
+
+    The update listener is also called when the entry data changes, like when
+    the access token is refreshed, which must not reload the entry.
+    """
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and entry_data["options"] == entry.options:
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a config entry."""
+    for key in (
+        STORAGE_KEY_DASHBOARD,
+        STORAGE_KEY_ENERGY_BACKFILL,
+        STORAGE_KEY_SCHEDULES,
+        STORAGE_KEY_TECHNICAL_INFO,
+    ):
+        await Store(
+            hass, STORAGE_VERSION, key.format(entry_id=entry.entry_id)
+        ).async_remove()
@@ -0,0 +1,239 @@
+"""Thermal analytics derived from the Remeha Home dashboard and consumption."""
+
+from __future__ import annotations
+from collections import deque
+from collections.abc import Iterable
+
+from .const import (
+    ANALYTICS_BUFFER_SIZE,
+    ANALYTICS_MAX_GAP,
+    COP_WINDOW,
+    HEATING_WINDOW,
+)
+from .models import Appliance
+
+# Comfort demands during which a climate zone is heating
+HEATING_DEMANDS = ("ProducingHeat", "RequestingHeat")
+
+
+def analytics_context(item_id: str) -> str:
+    """Return the listener context of the analytics of an item."""
+    return f"{item_id}_analytics"
+
+
+class RollingSums:
+    """Sums of two values over a sliding time window, updated in O(1).
+
+    Samples are kept in a ring buffer of a fixed size. When the buffer is full
+    the oldest sample is dropped, even if it is still inside the window.
+    """
+
+    __slots__ = ("_window", "_size", "_samples", "first", "second")
+
+    def __init__(self, window: float, size: int = ANALYTICS_BUFFER_SIZE) -> None:
+        """Create empty sums over a window of the supplied seconds."""
+        self._window = window
+        self._size = size
+        self._samples: deque[tuple[float, float, float]] = deque()
+        self.first = 0.0
+        self.second = 0.0
+
+    def add(self, time: float, first: float, second: float) -> None:
+        """Add a sample and drop the samples that left the window."""
+        if len(self._samples) == self._size:
+            self._drop_oldest()
+        self._samples.append((time, first, second))
+        self.first += first
+        self.second += second
+        self.expire(time)
+
+    def expire(self, time: float) -> None:
+        """Drop the samples that left the window at the supplied time."""
+        while self._samples and self._samples[0][0] <= time - self._window:
+            self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        """Remove the oldest sample from the sums."""
+        _, first, second = self._samples.popleft()
+        self.first -= first
+        self.second -= second
+
+    def ratio(self) -> float | None:
+        """Return the first sum divided by the second sum."""
+        # Subtracting floats can leave a tiny remainder instead of zero
+        if not self._samples or self.second <= 1e-9:
+            return None
+        return self.first / self.second
+
+
+class _ZoneAnalytics:
+    """Heating rate and duty cycle of a climate zone."""
+
+    __slots__ = ("previous", "heating", "duty_cycle")
+
+    def __init__(self) -> None:
+        """Create the analytics of a climate zone without samples."""
+        # Time, room temperature and whether the zone was heating
+        self.previous: tuple[float, float | None, bool] | None = None
+        # Temperature rise and duration while heating
+        self.heating = RollingSums(HEATING_WINDOW)
+        # Heating duration and total duration
+        self.duty_cycle = RollingSums(HEATING_WINDOW)
+
+
+class _CopAnalytics:
+    """Coefficient of performance from the delivered and consumed energy."""
+
+    __slots__ = ("previous", "energy")
+
+    def __init__(self) -> None:
+        """Create the analytics of an energy counter without samples."""
+        # Delivered and consumed energy of today
+        self.previous: tuple[float, float] | None = None
+        # Delivered and consumed energy within the window
+        self.energy = RollingSums(COP_WINDOW)
+
+
+def _increment(previous: float, current: float) -> float:
+    """Return the increment of a counter of today, which resets at midnight."""
+    if current < previous:
+        return current
+    return current - previous
+
+
+class ThermalAnalytics:
+    """Rolling thermal analytics of climate zones, appliances and producers.
+
+    Every poll adds a single sample per item, so the cost does not depend on
+    the length of the history:
+    - the heating rate is the room temperature rise per hour while a climate
+      zone is heating, during the last hour
+    - the duty cycle is the percentage of time a climate zone is heating,
+      during the last hour
+    - the coefficient of performance is the delivered heat divided by the
+      consumed energy of an appliance or electric producer, during the last day
+    Intervals longer than the maximum gap, like an outage, are not counted.
+    """
+
+    def __init__(self) -> None:
+        """Create empty analytics."""
+        self._zones: dict[str, _ZoneAnalytics] = {}
+        self._cops: dict[str, _CopAnalytics] = {}
+        self._values: dict[str, tuple] = {}
+
+    def heating_rate(self, climate_zone_id: str) -> float | None:
+        """Return the heating rate of a climate zone in degrees per hour."""
+        return self._values.get(climate_zone_id, (None, None))[0]
+
+    def duty_cycle(self, climate_zone_id: str) -> float | None:
+        """Return the heating duty cycle of a climate zone in percent."""
+        return self._values.get(climate_zone_id, (None, None))[1]
+
+    def cop(self, item_id: str) -> float | None:
+        """Return the coefficient of performance of an appliance or producer."""
+        return self._values.get(item_id, (None,))[0]
+
+    def update(self, appliances: Iterable[Appliance], now: float) -> set[str]:
+        """Add a sample of every item, return the contexts of changed values."""
+        changed = set()
+        for appliance in appliances:
+            for climate_zone in appliance.climate_zones:
+                values = self._update_zone(
+                    climate_zone.climate_zone_id,
+                    now,
+                    climate_zone.room_temperature,
+                    climate_zone.active_comfort_demand in HEATING_DEMANDS,
+                )
+                if self._store(climate_zone.climate_zone_id, values):
+                    changed.add(analytics_context(climate_zone.climate_zone_id))
+
+            consumption_data = appliance.consumption_data
+            counters = [
+                (
+                    appliance.appliance_id,
+                    consumption_data.get("heatingEnergyDelivered"),
+                    consumption_data.get("heatingEnergyConsumed"),
+                )
+            ]
+            counters += [
+                (
+                    f"{appliance.appliance_id}_{producer.instance_within_device}",
+                    producer.energy_production_ch,
+                    producer.energy_consumption_ch,
+                )
+                for producer in appliance.producers
+                # The consumption of gas producers is in cubic meters
+                if producer.energy_type != "NaturalGas"
+            ]
+            for item_id, delivered, consumed in counters:
+                values = (self._update_cop(item_id, delivered, consumed, now),)
+                if self._store(item_id, values):
+                    changed.add(analytics_context(item_id))
+
+        return changed
+
+    def _store(self, item_id: str, values: tuple) -> bool:
+        """Store the values of an item and return whether they changed."""
+        if self._values.get(item_id) == values:
+            return False
+        self._values[item_id] = values
+        return True
+
+    def _update_zone(
+        self, climate_zone_id: str, now: float, temperature: float | None, heating: bool
+    ) -> tuple[float | None, float | None]:
+        """Add a sample of a climate zone and return its rate and duty cycle."""
+        zone = self._zones.get(climate_zone_id)
+        if zone is None:
+            zone = self._zones[climate_zone_id] = _ZoneAnalytics()
+
+        if zone.previous is not None:
+            previous_time, previous_temperature, was_heating = zone.previous
+            duration = now - previous_time
+            if 0 < duration <= ANALYTICS_MAX_GAP:
+                # The state at the start of the interval lasted the whole interval
+                zone.duty_cycle.add(now, duration if was_heating else 0.0, duration)
+                if (
+                    was_heating
+                    and temperature is not None
+                    and previous_temperature is not None
+                ):
+                    zone.heating.add(now, temperature - previous_temperature, duration)
+        zone.previous = (now, temperature, heating)
+        zone.heating.expire(now)
+
+        heating_rate = zone.heating.ratio()
+        duty_cycle = zone.duty_cycle.ratio()
+        return (
+            None if heating_rate is None else round(heating_rate * 3600, 2),
+            None if duty_cycle is None else round(duty_cycle * 100, 1),
+        )
+
+    def _update_cop(
+        self,
+        item_id: str,
+        delivered: float | None,
+        consumed: float | None,
+        now: float,
+    ) -> float | None:
+        """Add a sample of an energy counter and return its COP."""
+        analytics = self._cops.get(item_id)
+        if analytics is None:
+            analytics = self._cops[item_id] = _CopAnalytics()
+        if delivered is None or consumed is None:
+            return None
+
+        delivered = float(delivered)
+        consumed = float(consumed)
+        if analytics.previous is not None:
+            previous_delivered, previous_consumed = analytics.previous
+            delivered_increment = _increment(previous_delivered, delivered)
+            consumed_increment = _increment(previous_consumed, consumed)
+            # Only changes are kept, so the buffer covers the whole window
+            if delivered_increment or consumed_increment:
+                analytics.energy.add(now, delivered_increment, consumed_increment)
+        analytics.previous = (delivered, consumed)
+        analytics.energy.expire(now)
+
+        cop = analytics.energy.ratio()
+        return None if cop is None else round(cop, 2)
@@ -5,22 +5,41 @@ import datetime
 import hashlib
 import json
 import logging
+import random
 import secrets
+import time
 import urllib
+from collections.abc import Coroutine
 
 import asyncio
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 
 from homeassistant.helpers.config_entry_oauth2_flow import (
     AbstractOAuth2Implementation,
     OAuth2Session,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
-
-from .const import DOMAIN
+from homeassistant.util.json import json_loads
+
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    CIRCUIT_BREAKER_THRESHOLD,
+    DOMAIN,
+    MAX_REQUEST_ATTEMPTS,
+    MAX_RETRY_AFTER,
+    RETRY_BACKOFF,
+    TOKEN_REFRESH_RETRY_DELAY,
+)
+from .helpers import parse_retry_after
+from .metrics import RequestMetrics, endpoint_name
+from .profiling import TimingSpans
+from .traffic import TrafficRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
+API_BASE_URL = "https://api.bdrthermea.net/Mobile/api"
+
 
 class RemehaHomeAPI:
     """Provide Remeha Home authentication tied to an OAuth2 based config entry."""
@@ -28,40 +47,272 @@ class RemehaHomeAPI:
     def __init__(
         self,
         oauth_session: OAuth2Session = None,
+        base_url: str = API_BASE_URL,
+        session: ClientSession | None = None,
     ) -> None:
-        """Initialize Remeha Home auth."""
+        """Initialize Remeha Home auth.
+
+        When a session is supplied, API requests are made using that session
+        instead of the session of Home Assistant. Without an OAuth session the
+        requests are not authorized, which is used to replay recorded traffic.
+        """
         self._oauth_session = oauth_session
+        self._base_url = base_url
+        self._session = session
+        self._dashboard_etag: str | None = None
+        self._dashboard_last_modified: str | None = None
+        self._dashboard_hash: bytes | None = None
+        self._token_lock = asyncio.Lock()
+        self.token_refresh_statistics = {
+            "refreshes": 0,
+            "failures": 0,
+            "last_latency": None,
+            "max_latency": None,
+        }
+        self.circuit_breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_RESET_TIMEOUT
+        )
+        self.metrics = RequestMetrics()
+        self.recorder: TrafficRecorder | None = None
+        self.spans = TimingSpans()
 
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
-        if not self._oauth_session.valid_token:
-            await self._oauth_session.async_ensure_token_valid()
+        await self._async_ensure_token_valid()
 
         return self._oauth_session.token["access_token"]
 
+    async def _async_ensure_token_valid(self) -> None:
+        """Refresh the access token when it is no longer valid.
+
+        Concurrent requests share a single refresh instead of each refreshing the
+        token on their own.
+        """
+        if self._oauth_session is None or self._oauth_session.valid_token:
+            return
+
+        async with self._token_lock:
+            # The token may have been refreshed while waiting for the lock
+            if not self._oauth_session.valid_token:
+                await self._async_measure_token_refresh(
+                    self._oauth_session.async_ensure_token_valid()
+                )
+
+    async def _async_measure_token_refresh(self, refresh: Coroutine) -> None:
+        """Run a token refresh and record its latency or failure."""
+        start = time.monotonic()
+        try:
+            await refresh
+        except Exception:
+            self.token_refresh_statistics["failures"] += 1
+            raise
+
+        latency = round(time.monotonic() - start, 3)
+        statistics = self.token_refresh_statistics
+        statistics["refreshes"] += 1
+        statistics["last_latency"] = latency
+        statistics["max_latency"] = max(statistics["max_latency"] or 0, latency)
+
+    async def async_refresh_token_ahead_of_expiry(self, margin: int) -> None:
+        """Keep refreshing the access token the supplied seconds before it expires.
+
+        This keeps requests from having to wait for a token refresh. When a
+        refresh fails it is retried until the token expires, after that requests
+        refresh it on their own. When the refresh token is rejected, a
+        reauthentication is started and the token is no longer refreshed.
+        """
+        session = self._oauth_session
+        while True:
+            delay = session.token["expires_at"] - margin - time.time()
+            await asyncio.sleep(max(delay, TOKEN_REFRESH_RETRY_DELAY))
+
+            try:
+                async with self._token_lock:
+                    expires_at = session.token["expires_at"]
+                    if expires_at - margin > time.time():
+                        # Already refreshed by a request while sleeping
+                        continue
+                    if expires_at <= time.time():
+                        # Expired, the next request refreshes the token
+                        continue
+                    await self._async_measure_token_refresh(
+                        self._async_force_token_refresh()
+                    )
+            except ConfigEntryAuthFailed as err:
+                _LOGGER.warning("Refresh token was rejected: %s", err)
+                session.config_entry.async_start_reauth(session.hass)
+                return
+            except (ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.warning("Failed to refresh the access token: %s", err)
+
+    async def _async_force_token_refresh(self) -> None:
+        """Refresh the access token, even when it is still valid."""
+        session = self._oauth_session
+        new_token = await session.implementation.async_refresh_token(session.token)
+        session.hass.config_entries.async_update_entry(
+            session.config_entry, data={**session.config_entry.data, "token": new_token}
+        )
+
     async def _async_api_request(self, method: str, path: str, **kwargs):
-        headers = kwargs.pop("headers", {})
-        return await self._oauth_session.async_request(
-            method,
-            "https://api.bdrthermea.net/Mobile/api" + path,
-            **kwargs,
-            headers={
+        """Make an API request and return the response of the last attempt.
+
+        Requests that were rate limited are retried after the delay requested
+        by the server, GET requests are also retried after a server or
+        connection error. Other requests are never sent twice, as they may
+        have been executed already.
+        """
+        if method != "GET":
+            # Any command can change the dashboard, so it must be fully requested again
+            self.invalidate_dashboard()
+
+        headers = {
+            **kwargs.pop("headers", {}),
+            "Ocp-Apim-Subscription-Key": "df605c5470d846fc91e848b1cc653ddf",
+        }
+        endpoint = endpoint_name(method, path)
+        for attempt in range(1, MAX_REQUEST_ATTEMPTS + 1):
+            self.circuit_breaker.before_request()
+            start = time.monotonic()
+            try:
+                response = await self._async_send_request(
+                    method, path, headers=headers, **kwargs
+                )
+                # Read the body here, so its transfer is part of the latency
+                body = await response.read()
+            except asyncio.CancelledError:
+                # Cancelled by a timeout of the caller, or a trial request would
+                # keep the circuit breaker half open
+                self.metrics.record_request(endpoint, time.monotonic() - start, None)
+                self.circuit_breaker.record_failure()
+                raise
+            except (ClientError, asyncio.TimeoutError):
+                self.metrics.record_request(endpoint, time.monotonic() - start, None)
+                self.circuit_breaker.record_failure()
+                if method != "GET" or attempt == MAX_REQUEST_ATTEMPTS:
+                    raise
+                delay = self._backoff_delay(attempt)
+            except Exception:
+                # Not a failure of the API, but a trial request must never keep
+                # the circuit breaker half open
+                self.circuit_breaker.release_trial()
+                raise
+            else:
+                latency = time.monotonic() - start
+                self.metrics.record_request(
+                    endpoint, latency, response.status, len(body)
+                )
+                if self.recorder is not None and method == "GET":
+                    self.recorder.record(
+                        method, path, response.status, latency, response.headers, body
+                    )
+                if response.status != 429 and response.status < 500:
+                    self.circuit_breaker.record_success()
+                    return response
+
+                self.circuit_breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                    # Stop requesting until the server accepts requests again
+                    self.circuit_breaker.open(retry_after)
+                    return response
+                if attempt == MAX_REQUEST_ATTEMPTS or (
+                    method != "GET" and response.status != 429
+                ):
+                    return response
+
+                response.release()
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self._backoff_delay(attempt)
+                )
+
+            self.metrics.record_retry(endpoint)
+            _LOGGER.debug(
+                "Retrying %s %s in %.1f seconds (attempt %d of %d)",
+                method,
+                path,
+                delay,
+                attempt + 1,
+                MAX_REQUEST_ATTEMPTS,
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Return the jittered exponential backoff delay after an attempt."""
+        return RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+
+    async def _async_send_request(self, method: str, path: str, headers: dict, **kwargs):
+        """Send a single API request with a valid access token."""
+        await self._async_ensure_token_valid()
+
+        if self._session is None:
+            return await self._oauth_session.async_request(
+                method, self._base_url + path, **kwargs, headers=headers
+            )
+
+        if self._oauth_session is not None:
+            headers = {
                 **headers,
-                "Ocp-Apim-Subscription-Key": "df605c5470d846fc91e848b1cc653ddf",
-            },
+                "authorization": f"Bearer {self._oauth_session.token['access_token']}",
+            }
+        return await self._session.request(
+            method, self._base_url + path, **kwargs, headers=headers
         )
 
-    async def async_get_dashboard(self) -> dict:
-        """Return the Remeha Home dashboard JSON."""
-        # Add a timestamp to the request to prevent caching
-        timestamp = int(datetime.datetime.now().timestamp())
-        response = await self._async_api_request(
-            "GET", f"/homes/dashboard?t={timestamp}"
-        )
+    async def async_get_dashboard(self, conditional: bool = False) -> dict | None:
+        """Return the Remeha Home dashboard JSON.
+
+        When conditional is set, None is returned if the dashboard did not change
+        since the previous request. The server is asked to check this using the
+        ETag and Last-Modified validators, when it provides neither the contents
+        of the response are compared instead.
+        """
+        headers = {}
+        if conditional:
+            # Let the server revalidate the dashboard instead of defeating caching
+            path = "/homes/dashboard"
+            headers["Cache-Control"] = "no-cache"
+            if self._dashboard_etag is not None:
+                headers["If-None-Match"] = self._dashboard_etag
+            if self._dashboard_last_modified is not None:
+                headers["If-Modified-Since"] = self._dashboard_last_modified
+        else:
+            # Add a timestamp to the request to prevent caching
+            timestamp = int(datetime.datetime.now().timestamp())
+            path = f"/homes/dashboard?t={timestamp}"
+
+        with self.spans.span("fetch"):
+            response = await self._async_api_request("GET", path, headers=headers)
+        if conditional and response.status == 304:
+            response.release()
+            return None
+
         response.raise_for_status()
-        json = await response.json()
-        _LOGGER.debug(json)
-        return json
+        body = await response.read()
+        self._dashboard_etag = response.headers.get("ETag")
+        self._dashboard_last_modified = response.headers.get("Last-Modified")
+
+        body_hash = hashlib.sha256(body).digest()
+        if conditional and body_hash == self._dashboard_hash:
+            return None
+        self._dashboard_hash = body_hash
+
+        with self.spans.span("parse"):
+            dashboard = json_loads(body)
+        _LOGGER.debug(
+            "Requested dashboard of %d bytes with %d appliances",
+            len(body),
+            len(dashboard["appliances"]),
+        )
+        return dashboard
+
+    def invalidate_dashboard(self) -> None:
+        """Forget the dashboard validators, so the next request is never skipped."""
+        self._dashboard_etag = None
+        self._dashboard_last_modified = None
+        self._dashboard_hash = None
 
     async def async_set_manual(self, climate_zone_id: str, setpoint: float):
         """Set a climate zone to manual mode with a specific temperature setpoint."""
@@ -126,6 +377,52 @@ class RemehaHomeAPI:
         )
         response.raise_for_status()
 
+    async def async_set_hot_water_anti_frost(self, hot_water_zone_id: str):
+        """Set a hot water zone to anti-frost (eco) mode."""
+        response = await self._async_api_request(
+            "POST",
+            f"/hot-water-zones/{hot_water_zone_id}/modes/anti-frost",
+        )
+        response.raise_for_status()
+
+    async def async_set_hot_water_schedule(self, hot_water_zone_id: str):
+        """Set a hot water zone to schedule mode."""
+        response = await self._async_api_request(
+            "POST",
+            f"/hot-water-zones/{hot_water_zone_id}/modes/schedule",
+        )
+        response.raise_for_status()
+
+    async def async_set_hot_water_continuous_comfort(self, hot_water_zone_id: str):
+        """Set a hot water zone to continuous comfort mode."""
+        response = await self._async_api_request(
+            "POST",
+            f"/hot-water-zones/{hot_water_zone_id}/modes/continuous-comfort",
+        )
+        response.raise_for_status()
+
+    async def async_set_hot_water_comfort_setpoint(
+        self, hot_water_zone_id: str, setpoint: float
+    ):
+        """Set the comfort temperature setpoint of a hot water zone."""
+        response = await self._async_api_request(
+            "POST",
+            f"/hot-water-zones/{hot_water_zone_id}/comfort-setpoint",
+            json={"comfortSetpoint": setpoint},
+        )
+        response.raise_for_status()
+
+    async def async_set_hot_water_reduced_setpoint(
+        self, hot_water_zone_id: str, setpoint: float
+    ):
+        """Set the reduced (eco) temperature setpoint of a hot water zone."""
+        response = await self._async_api_request(
+            "POST",
+            f"/hot-water-zones/{hot_water_zone_id}/reduced-setpoint",
+            json={"reducedSetpoint": setpoint},
+        )
+        response.raise_for_status()
+
     async def async_get_appliance_technical_information(
         self, appliance_id: str
     ) -> dict:
@@ -140,24 +437,36 @@ class RemehaHomeAPI:
         return json
 
     async def async_get_consumption_data_for_today(self, appliance_id: str) -> dict:
-        """Get technical information for an appliance."""
+        """Get the consumption data of today for an appliance."""
         today = datetime.datetime.now().replace(
             hour=0, minute=0, second=0, microsecond=0
         )
         end_of_today = today + datetime.timedelta(hours=23, minutes=59, seconds=59)
 
-        today_string = today.strftime("%Y-%m-%d %H:%M:%S.%fZ")
-        end_of_today_string = end_of_today.strftime("%Y-%m-%d %H:%M:%S.%fZ")
+        return await self.async_get_consumption_data(
+            appliance_id, "daily", today, end_of_today
+        )
+
+    async def async_get_consumption_data(
+        self,
+        appliance_id: str,
+        period: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict:
+        """Get the daily, monthly or yearly consumption data for an appliance."""
+        start_string = start.strftime("%Y-%m-%d %H:%M:%S.%fZ")
+        end_string = end.strftime("%Y-%m-%d %H:%M:%S.%fZ")
 
         response = await self._async_api_request(
             "GET",
-            f"/appliances/{appliance_id}/energyconsumption/daily?startDate={today_string}&endDate={end_of_today_string}",
+            f"/appliances/{appliance_id}/energyconsumption/{period}?startDate={start_string}&endDate={end_string}",
         )
         response.raise_for_status()
-        json =await response.json()
+        json = await response.json()
         _LOGGER.debug(json)
         return json
-    
+
 
 class RemehaHomeAuthFailed(Exception):
     """Error to indicate that authentication failed."""
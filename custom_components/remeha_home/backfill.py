@@ -0,0 +1,201 @@
+"""Backfill of historical energy consumption into long-term statistics."""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+import logging
+
+import asyncio
+from aiohttp.client_exceptions import ClientError
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .api import RemehaHomeAPI
+from .const import (
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_MAX_DAYS,
+    DOMAIN,
+    REQUEST_TIMEOUT,
+    STORAGE_KEY_ENERGY_BACKFILL,
+    STORAGE_VERSION,
+)
+from .coordinator import RemehaHomeUpdateCoordinator
+from .models import Appliance
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consumption data keys imported as statistics, with the name of the statistic
+CONSUMPTION_STATISTICS = {
+    "heatingEnergyConsumed": "Heating Energy Consumed",
+    "hotWaterEnergyConsumed": "Hot Water Energy Consumed",
+    "coolingEnergyConsumed": "Cooling Energy Consumed",
+    "heatingEnergyDelivered": "Heating Energy Delivered",
+    "hotWaterEnergyDelivered": "Hot Water Energy Delivered",
+    "coolingEnergyDelivered": "Cooling Energy Delivered",
+}
+
+
+class RemehaHomeEnergyBackfill:
+    """Import the historical consumption of appliances as external statistics.
+
+    The first day with consumption is found using the yearly and monthly
+    consumption, after which the daily consumption is requested in chunks. A
+    watermark is stored after every chunk, so an interrupted backfill resumes
+    where it stopped and later runs only request the days after the watermark.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: RemehaHomeAPI,
+        coordinator: RemehaHomeUpdateCoordinator,
+    ) -> None:
+        """Create a Remeha Home energy backfill."""
+        self._hass = hass
+        self._api = api
+        self._coordinator = coordinator
+        self._store = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_ENERGY_BACKFILL.format(entry_id=config_entry.entry_id),
+        )
+        self._state: dict | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def watermarks(self) -> dict[str, str]:
+        """Return the end of the imported history for each appliance."""
+        if self._state is None:
+            return {}
+        return {
+            appliance_id: state["watermark"]
+            for appliance_id, state in self._state["appliances"].items()
+        }
+
+    async def async_run(self, now: datetime | None = None) -> None:
+        """Import all complete days that were not imported yet."""
+        if self._coordinator.data is None:
+            return
+
+        async with self._lock:
+            if self._state is None:
+                self._state = await self._store.async_load() or {"appliances": {}}
+
+            # Only import complete days, today is covered by the sensors
+            end = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            for appliance in self._coordinator.data:
+                try:
+                    await self._async_backfill_appliance(appliance, end)
+                except (ClientError, asyncio.TimeoutError) as err:
+                    _LOGGER.warning(
+                        "Failed to backfill consumption data for appliance %s, resuming during the next run: %s",
+                        appliance.appliance_id,
+                        err,
+                    )
+
+    async def _async_backfill_appliance(
+        self, appliance: Appliance, end: datetime
+    ) -> None:
+        """Import the daily consumption of an appliance up to the supplied end."""
+        appliance_id = appliance.appliance_id
+        state = self._state["appliances"].get(appliance_id)
+        if state is None:
+            start = await self._async_find_history_start(appliance_id, end)
+            state = {
+                "watermark": start.isoformat(),
+                "sums": dict.fromkeys(CONSUMPTION_STATISTICS, 0.0),
+            }
+            self._state["appliances"][appliance_id] = state
+
+        watermark = dt_util.parse_datetime(state["watermark"])
+        while watermark < end:
+            chunk_end = min(watermark + timedelta(days=BACKFILL_CHUNK_DAYS), end)
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                consumption_data = await self._api.async_get_consumption_data(
+                    appliance_id, "daily", watermark, chunk_end - timedelta(seconds=1)
+                )
+
+            statistics = {key: [] for key in CONSUMPTION_STATISTICS}
+            for entry in sorted(consumption_data["data"], key=lambda e: e["timeStamp"]):
+                start = dt_util.parse_datetime(entry["timeStamp"])
+                if start is None or not watermark <= start < chunk_end:
+                    continue
+                for key, data in statistics.items():
+                    state["sums"][key] += float(entry.get(key) or 0)
+                    data.append(
+                        StatisticData(
+                            start=start, state=state["sums"][key], sum=state["sums"][key]
+                        )
+                    )
+
+            for key, data in statistics.items():
+                if data:
+                    async_add_external_statistics(
+                        self._hass, self._metadata(appliance, key), data
+                    )
+
+            watermark = chunk_end
+            state["watermark"] = watermark.isoformat()
+            await self._store.async_save(self._state)
+            _LOGGER.debug(
+                "Backfilled consumption data for appliance %s up to %s",
+                appliance_id,
+                watermark,
+            )
+
+    async def _async_find_history_start(
+        self, appliance_id: str, end: datetime
+    ) -> datetime:
+        """Return the start of the first month with consumption of an appliance."""
+        earliest = end - timedelta(days=BACKFILL_MAX_DAYS)
+        start = await self._async_find_first_consumption(
+            appliance_id, "yearly", earliest, end
+        )
+        if start is None:
+            return end
+
+        # Narrow the first year with consumption down to the first month
+        start = max(start, earliest)
+        year_end = min(start.replace(year=start.year + 1, month=1, day=1), end)
+        month_start = await self._async_find_first_consumption(
+            appliance_id, "monthly", start, year_end
+        )
+        return max(month_start or start, earliest)
+
+    async def _async_find_first_consumption(
+        self, appliance_id: str, period: str, start: datetime, end: datetime
+    ) -> datetime | None:
+        """Return the start of the first period with any consumption."""
+        async with asyncio.timeout(REQUEST_TIMEOUT):
+            consumption_data = await self._api.async_get_consumption_data(
+                appliance_id, period, start, end - timedelta(seconds=1)
+            )
+
+        for entry in sorted(consumption_data["data"], key=lambda e: e["timeStamp"]):
+            if any(entry.get(key) for key in CONSUMPTION_STATISTICS):
+                return dt_util.parse_datetime(entry["timeStamp"])
+        return None
+
+    @staticmethod
+    def _metadata(appliance: Appliance, key: str) -> StatisticMetaData:
+        """Return the metadata of a consumption statistic of an appliance."""
+        object_id = "_".join(
+            [
+                appliance.appliance_id.replace("-", "_").lower(),
+                "".join("_" + c.lower() if c.isupper() else c for c in key),
+            ]
+        )
+        return StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{appliance.house_name} {CONSUMPTION_STATISTICS[key]}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{object_id}",
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
@@ -0,0 +1,88 @@
+"""Platform for Remeha Home calendar integration."""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
+from .models import ClimateZone
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Remeha Home calendar entities from a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    entities = []
+    for appliance in coordinator.data:
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
+            entities.append(RemehaHomeScheduleCalendar(coordinator, climate_zone_id))
+
+    async_add_entities(entities)
+
+
+class RemehaHomeScheduleCalendar(RemehaHomeEntity, CalendarEntity):
+    """Calendar with the setpoints of the active time program of a climate zone.
+
+    The events are predicted from the schedule cache of the coordinator, which
+    only knows the switches that were observed during the last week.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Schedule"
+
+    def __init__(
+        self, coordinator: RemehaHomeUpdateCoordinator, climate_zone_id: str
+    ) -> None:
+        """Create a Remeha Home schedule calendar entity."""
+        super().__init__(coordinator, context=climate_zone_id)
+        self.climate_zone_id = climate_zone_id
+        self._attr_unique_id = "_".join([DOMAIN, self.climate_zone_id, "schedule"])
+
+    @property
+    def _data(self) -> ClimateZone:
+        """Return the climate zone information from the coordinator."""
+        return self.coordinator.get_by_id(self.climate_zone_id)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for this device."""
+        return self.coordinator.get_device_info(self.climate_zone_id)
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current setpoint of the time program."""
+        now = dt_util.now()
+        events = self._events(now, now + timedelta(seconds=1))
+        return events[0] if events else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the setpoints of the time program between the supplied dates."""
+        return self._events(start_date, end_date)
+
+    def _events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return the predicted setpoints as calendar events."""
+        return [
+            CalendarEvent(
+                start=switch_time,
+                end=next_switch_time,
+                summary=f"{setpoint} °C",
+            )
+            for switch_time, next_switch_time, setpoint in (
+                self.coordinator.schedules.switches(self._data, start, end)
+            )
+        ]
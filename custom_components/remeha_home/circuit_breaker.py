@@ -0,0 +1,130 @@
+"""Circuit breaker that stops requesting the Remeha Home API during outages."""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+import time
+
+from aiohttp import ClientError
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ClientError):
+    """Error to indicate that a request was not sent because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Refuse requests for a while after repeated failures.
+
+    The circuit opens after a number of consecutive failed requests, or when the
+    server asks to wait using Retry-After. While it is open all requests are
+    refused. Once the reset timeout passed the circuit is half open and a single
+    trial request is sent, which closes the circuit when it succeeds and opens
+    it again when it fails.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Create a closed circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._opened_until: float | None = None
+        self._trial_in_progress = False
+        self._listeners: list[Callable[[], None]] = []
+        self.consecutive_failures = 0
+        self.open_count = 0
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call the listener when the circuit opens or closes, return a remover."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        if self._opened_until is None:
+            return STATE_CLOSED
+        if time.monotonic() < self._opened_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def seconds_until_retry(self) -> float | None:
+        """Return the time until the circuit is half open, while it is open."""
+        if self.state != STATE_OPEN:
+            return None
+        return round(self._opened_until - time.monotonic(), 1)
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError when no request may be sent right now."""
+        state = self.state
+        if state == STATE_OPEN or (
+            state == STATE_HALF_OPEN and self._trial_in_progress
+        ):
+            raise CircuitOpenError(
+                "Not requesting the Remeha Home API after repeated failures"
+            )
+        if state == STATE_HALF_OPEN:
+            self._trial_in_progress = True
+
+    def release_trial(self) -> None:
+        """Allow another trial request after one ended without a result.
+
+        This is used when a request failed before reaching the API, like when
+        the access token could not be refreshed.
+        """
+        self._trial_in_progress = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.consecutive_failures = 0
+        if self._opened_until is None:
+            return
+
+        _LOGGER.info("Remeha Home API is available again")
+        self._opened_until = None
+        self._trial_in_progress = False
+        self._notify_listeners()
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit when it failed too often."""
+        self.consecutive_failures += 1
+        if (
+            self._trial_in_progress
+            or self.consecutive_failures >= self._failure_threshold
+        ):
+            self.open(self._reset_timeout)
+
+    def open(self, duration: float) -> None:
+        """Open the circuit for at least the supplied number of seconds."""
+        opened_until = time.monotonic() + duration
+        if self.state == STATE_OPEN and self._opened_until >= opened_until:
+            return
+
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(
+                "Remeha Home API is unavailable, not requesting it for %.0f seconds",
+                duration,
+            )
+            self.open_count += 1
+        self._opened_until = opened_until
+        self._trial_in_progress = False
+        self._notify_listeners()
+
+    def _notify_listeners(self) -> None:
+        """Call the listeners after a change of the state."""
+        for listener in list(self._listeners):
+            listener()
+
+    def as_dict(self) -> dict:
+        """Return the state of the circuit breaker for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+            "seconds_until_retry": self.seconds_until_retry,
+        }
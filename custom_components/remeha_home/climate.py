@@ -1,10 +1,15 @@
 """Platform for Remeha Home climate integration."""
 
 from __future__ import annotations
+from collections.abc import Coroutine
 from typing import Any
 import logging
 
+import voluptuous as vol
+
 from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
     ClimateEntity,
     ClimateEntityFeature,
     HVACAction,
@@ -15,11 +20,12 @@ from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemper
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import RemehaHomeAPI
 from .const import DOMAIN
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
+from .models import ClimateZone
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +61,88 @@ PRESET_MODE_TO_PRESET_INDEX = {
 }
 
 
+def _validate_zone_scene(scene: dict[str, Any]) -> dict[str, Any]:
+    """Check that a preset is only combined with auto mode."""
+    hvac_mode = scene.get(ATTR_HVAC_MODE, HVACMode.AUTO)
+    if ATTR_PRESET_MODE in scene and hvac_mode != HVACMode.AUTO:
+        raise vol.Invalid("A preset can only be applied in auto mode")
+    return scene
+
+
+ZONE_SCENE_SCHEMA = vol.All(
+    {
+        vol.Optional(ATTR_HVAC_MODE): vol.All(
+            vol.Coerce(HVACMode), vol.In(HVAC_MODE_TO_REMEHA_MODE)
+        ),
+        vol.Optional(ATTR_PRESET_MODE): vol.In(PRESET_MODE_TO_PRESET_INDEX),
+        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+    },
+    vol.Length(min=1),
+    _validate_zone_scene,
+)
+
+
+def zone_scene_command(
+    api: RemehaHomeAPI, climate_zone: ClimateZone, scene: dict[str, Any]
+) -> tuple[dict[str, Any], Coroutine]:
+    """Return the expected result and the command applying a scene to a zone.
+
+    A scene without a mode keeps the current mode, and a preset implies auto
+    mode. The temperature is the setpoint in heat mode and a temporary override
+    in auto mode, it is ignored when the zone is turned off.
+    """
+    climate_zone_id = climate_zone.climate_zone_id
+    # The command runs after the expected result was applied to the zone
+    current_mode = climate_zone.zone_mode
+    current_program = climate_zone.active_heating_climate_time_program_number
+    temperature = scene.get(ATTR_TEMPERATURE)
+    hvac_mode = scene.get(ATTR_HVAC_MODE)
+    if hvac_mode is None:
+        hvac_mode = (
+            HVACMode.AUTO
+            if ATTR_PRESET_MODE in scene
+            else REMEHA_MODE_TO_HVAC_MODE.get(current_mode, HVACMode.AUTO)
+        )
+
+    if hvac_mode == HVACMode.OFF:
+        return (
+            {"zone_mode": HVAC_MODE_TO_REMEHA_MODE[HVACMode.OFF]},
+            api.async_set_off(climate_zone_id),
+        )
+
+    if hvac_mode == HVACMode.HEAT:
+        set_point = climate_zone.set_point if temperature is None else temperature
+        return (
+            {
+                "zone_mode": HVAC_MODE_TO_REMEHA_MODE[HVACMode.HEAT],
+                "set_point": set_point,
+            },
+            api.async_set_manual(climate_zone_id, set_point),
+        )
+
+    program = PRESET_MODE_TO_PRESET_INDEX.get(
+        scene.get(ATTR_PRESET_MODE), current_program
+    )
+    expected = {
+        "zone_mode": HVAC_MODE_TO_REMEHA_MODE[HVACMode.AUTO],
+        "active_heating_climate_time_program_number": program,
+    }
+    if temperature is not None:
+        expected["zone_mode"] = "TemporaryOverride"
+        expected["set_point"] = temperature
+
+    async def apply_schedule() -> None:
+        if program != current_program:
+            await api.async_activate_heating_time_program(climate_zone_id, program)
+        # The schedule is resumed first, unless an override replaces an override
+        if current_mode not in ("Scheduling", expected["zone_mode"]):
+            await api.async_set_schedule(climate_zone_id, program)
+        if temperature is not None:
+            await api.async_set_temporary_override(climate_zone_id, temperature)
+
+    return expected, apply_schedule()
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -65,15 +153,15 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     entities = []
-    for appliance in coordinator.data["appliances"]:
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+    for appliance in coordinator.data:
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
             entities.append(RemehaHomeClimateEntity(api, coordinator, climate_zone_id))
 
     async_add_entities(entities)
 
 
-class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
+class RemehaHomeClimateEntity(RemehaHomeEntity, ClimateEntity):
     """Climate entity representing a Remeha Home climate zone."""
 
     _enable_turn_on_off_backwards_compatibility = False
@@ -96,7 +184,7 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         climate_zone_id: str,
     ) -> None:
         """Create a Remeha Home climate entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=climate_zone_id)
         self.api = api
         self.coordinator = coordinator
         self.climate_zone_id = climate_zone_id
@@ -104,7 +192,7 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         self._attr_unique_id = "_".join([DOMAIN, self.climate_zone_id])
 
     @property
-    def _data(self) -> dict:
+    def _data(self) -> ClimateZone:
         """Return the climate zone information from the coordinator."""
         return self.coordinator.get_by_id(self.climate_zone_id)
 
@@ -116,29 +204,34 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        return self._data["roomTemperature"]
+        return self._data.room_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
         if self.hvac_mode == HVACMode.OFF:
             return None
-        return self._data["setPoint"]
+        return self._data.set_point
 
     @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
-        return self._data["setPointMin"]
+        # Capability attributes are also written while the zone is unavailable
+        if self._data is None:
+            return super().min_temp
+        return self._data.set_point_min
 
     @property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
-        return self._data["setPointMax"]
+        if self._data is None:
+            return super().max_temp
+        return self._data.set_point_max
 
     @property
     def hvac_mode(self) -> HVACMode | str | None:
         """Return hvac target hvac state."""
-        mode = self._data["zoneMode"]
+        mode = self._data.zone_mode
         return REMEHA_MODE_TO_HVAC_MODE.get(mode)
 
     @property
@@ -152,7 +245,7 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         if self.hvac_mode == HVACMode.OFF:
             return HVACAction.OFF
 
-        action = self._data["activeComfortDemand"]
+        action = self._data.active_comfort_demand
         return REMEHA_STATUS_TO_HVAC_ACTION.get(action)
 
     @property
@@ -163,7 +256,7 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         if self.hvac_mode == HVACMode.HEAT:
             return "manual"
         return PRESET_INDEX_TO_PRESET_MODE[
-            self._data["activeHeatingClimateTimeProgramNumber"]
+            self._data.active_heating_climate_time_program_number
         ]
 
     @property
@@ -176,39 +269,45 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         if (temperature := kwargs.get(ATTR_TEMPERATURE)) is not None:
             _LOGGER.debug("Setting temperature to %f", temperature)
             if self.hvac_mode == HVACMode.AUTO:
-                await self.api.async_set_temporary_override(
-                    self.climate_zone_id, temperature
+                await self.coordinator.async_send_command(
+                    self.climate_zone_id,
+                    {"zone_mode": "TemporaryOverride", "set_point": temperature},
+                    self.api.async_set_temporary_override(
+                        self.climate_zone_id, temperature
+                    ),
+                    coalesce=True,
                 )
             elif self.hvac_mode == HVACMode.HEAT:
-                await self.api.async_set_manual(self.climate_zone_id, temperature)
-            elif self.hvac_mode == HVACMode.OFF:
-                return
-
-            await self.coordinator.async_request_refresh()
+                await self.coordinator.async_send_command(
+                    self.climate_zone_id,
+                    {"set_point": temperature},
+                    self.api.async_set_manual(self.climate_zone_id, temperature),
+                    coalesce=True,
+                )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new operation mode."""
         _LOGGER.debug("Setting operation mode to %s", hvac_mode)
 
-        # Temporarily override the coordinator state until the next poll
-        self._data["zoneMode"] = HVAC_MODE_TO_REMEHA_MODE.get(hvac_mode)
-        self.async_write_ha_state()
-
         if hvac_mode == HVACMode.AUTO:
-            await self.api.async_set_schedule(
+            command = self.api.async_set_schedule(
                 self.climate_zone_id,
-                self._data["activeHeatingClimateTimeProgramNumber"],
+                self._data.active_heating_climate_time_program_number,
             )
         elif hvac_mode == HVACMode.HEAT:
-            await self.api.async_set_manual(
-                self.climate_zone_id, self._data["setPoint"]
+            command = self.api.async_set_manual(
+                self.climate_zone_id, self._data.set_point
             )
         elif hvac_mode == HVACMode.OFF:
-            await self.api.async_set_off(self.climate_zone_id)
+            command = self.api.async_set_off(self.climate_zone_id)
         else:
             raise NotImplementedError()
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_send_command(
+            self.climate_zone_id,
+            {"zone_mode": HVAC_MODE_TO_REMEHA_MODE[hvac_mode]},
+            command,
+        )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
@@ -221,16 +320,20 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         target_preset = PRESET_MODE_TO_PRESET_INDEX[preset_mode]
         previous_hvac_mode = self.hvac_mode
 
-        self._data["zoneMode"] = HVAC_MODE_TO_REMEHA_MODE.get(HVACMode.AUTO)
-        self._data["activeHeatingClimateTimeProgramNumber"] = target_preset
-        self.async_write_ha_state()
-
-        # Switch the selected heating time program
-        await self.api.async_activate_heating_time_program(
-            self.climate_zone_id, target_preset
+        async def activate_preset() -> None:
+            # Switch the selected heating time program
+            await self.api.async_activate_heating_time_program(
+                self.climate_zone_id, target_preset
+            )
+            # Automatically make sure the mode is set to schedule
+            if previous_hvac_mode != HVACMode.AUTO:
+                await self.api.async_set_schedule(self.climate_zone_id, target_preset)
+
+        await self.coordinator.async_send_command(
+            self.climate_zone_id,
+            {
+                "zone_mode": HVAC_MODE_TO_REMEHA_MODE[HVACMode.AUTO],
+                "active_heating_climate_time_program_number": target_preset,
+            },
+            activate_preset(),
         )
-        # Automatically make sure the mode is set to schedule
-        if previous_hvac_mode != HVACMode.AUTO:
-            await self.api.async_set_schedule(self.climate_zone_id, target_preset)
-
-        await self.coordinator.async_request_refresh()
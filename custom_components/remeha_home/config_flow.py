@@ -8,10 +8,33 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.config_entry_oauth2_flow import AbstractOAuth2FlowHandler
 
-from .const import DOMAIN
+from .const import (
+    CONF_CONDITIONAL_DASHBOARD,
+    CONF_CONSUMPTION_UPDATE_INTERVAL,
+    CONF_ENERGY_BACKFILL,
+    CONF_MAX_PARALLEL_REQUESTS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_TECHNICAL_INFO_UPDATE_INTERVAL,
+    CONF_TOKEN_REFRESH_MARGIN,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_CONDITIONAL_DASHBOARD,
+    DEFAULT_CONSUMPTION_UPDATE_INTERVAL,
+    DEFAULT_ENERGY_BACKFILL,
+    DEFAULT_MAX_PARALLEL_REQUESTS,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL,
+    DEFAULT_TOKEN_REFRESH_MARGIN,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+)
 from .api import RemehaHomeAuthFailed, RemehaHomeOAuth2Implementation
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,6 +50,15 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
         """Create a Remeha Home login flow."""
         super().__init__()
         self.flow_impl: RemehaHomeOAuth2Implementation = None  # type: ignore
+        self._reauth_entry: config_entries.ConfigEntry | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return RemehaHomeOptionsFlowHandler()
 
     @property
     def logger(self) -> logging.Logger:
@@ -36,6 +68,9 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
     async def async_step_reauth(self, user_input=None):
         """Perform reauth upon an API authentication error."""
         _LOGGER.debug("reauth %s", user_input)
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
         return await self.async_step_reauth_confirm()
 
     async def async_step_reauth_confirm(self, user_input=None):
@@ -50,8 +85,6 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None):
         """Handle a flow start."""
-        await self.async_set_unique_id(DOMAIN)
-
         # Create a new session with a cookie jar that does not quote cookies
         # This is necessary to avoid issues with the Remeha Home authentication flow
         cookie_jar = aiohttp.CookieJar(quote_cookie=False)
@@ -95,11 +128,103 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
         return self.async_abort(reason="failed_to_authenticate")
 
     async def async_oauth_create_entry(self, data: dict) -> dict:
-        """Create an oauth config entry or update existing entry for reauth."""
-        existing_entry = await self.async_set_unique_id(DOMAIN)
-        if existing_entry:
-            self.hass.config_entries.async_update_entry(existing_entry, data=data)
-            await self.hass.config_entries.async_reload(existing_entry.entry_id)
+        """Create an oauth config entry or update existing entry for reauth.
+
+        Every account can be configured once, the email address of the account
+        is used as unique id. Entries created before multiple accounts were
+        supported get that unique id when they are re-authenticated.
+        """
+        unique_id = self.external_data["email"].lower()
+        if self._reauth_entry is not None:
+            if self._reauth_entry.unique_id not in (unique_id, DOMAIN):
+                return self.async_abort(reason="wrong_account")
+
+            self.hass.config_entries.async_update_entry(
+                self._reauth_entry, data=data, unique_id=unique_id
+            )
+            await self.hass.config_entries.async_reload(self._reauth_entry.entry_id)
             return self.async_abort(reason="reauth_successful")
 
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured()
         return self.async_create_entry(title=self.external_data["email"], data=data)
+
+
+class RemehaHomeOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow to tune how often and how the Remeha Home API is requested."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_MIN_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_CONSUMPTION_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_CONSUMPTION_UPDATE_INTERVAL,
+                            DEFAULT_CONSUMPTION_UPDATE_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                    vol.Required(
+                        CONF_TECHNICAL_INFO_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_TECHNICAL_INFO_UPDATE_INTERVAL,
+                            DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=3600)),
+                    vol.Required(
+                        CONF_MAX_PARALLEL_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_PARALLEL_REQUESTS, DEFAULT_MAX_PARALLEL_REQUESTS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Required(
+                        CONF_CONDITIONAL_DASHBOARD,
+                        default=options.get(
+                            CONF_CONDITIONAL_DASHBOARD, DEFAULT_CONDITIONAL_DASHBOARD
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_ENERGY_BACKFILL,
+                        default=options.get(
+                            CONF_ENERGY_BACKFILL, DEFAULT_ENERGY_BACKFILL
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_TOKEN_REFRESH_MARGIN,
+                        default=options.get(
+                            CONF_TOKEN_REFRESH_MARGIN, DEFAULT_TOKEN_REFRESH_MARGIN
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_RECORD_TRAFFIC,
+                        default=options.get(
+                            CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC
+                        ),
+                    ): bool,
+                }
+            ),
+        )
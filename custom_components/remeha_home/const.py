@@ -9,10 +9,169 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
     BinarySensorDeviceClass,
 )
-from homeassistant.const import UnitOfEnergy, UnitOfTemperature, UnitOfPressure, UnitOfVolume
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPressure,
+    UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolume,
+)
 
 DOMAIN = "remeha_home"
 
+CONF_MAX_PARALLEL_REQUESTS = "max_parallel_requests"
+CONF_CONDITIONAL_DASHBOARD = "conditional_dashboard"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_TOKEN_REFRESH_MARGIN = "token_refresh_margin"
+CONF_ENERGY_BACKFILL = "energy_backfill"
+CONF_CONSUMPTION_UPDATE_INTERVAL = "consumption_update_interval"
+CONF_TECHNICAL_INFO_UPDATE_INTERVAL = "technical_info_update_interval"
+CONF_RECORD_TRAFFIC = "record_traffic"
+
+# Maximum number of per-appliance API requests that may be in flight at once
+DEFAULT_MAX_PARALLEL_REQUESTS = 4
+
+# Skip processing the dashboard when the server reports it did not change
+DEFAULT_CONDITIONAL_DASHBOARD = True
+
+# Dashboard update intervals in seconds, the coordinator polls faster after a
+# command or around a schedule switch and backs off when all zones are idle
+DEFAULT_UPDATE_INTERVAL = 60
+DEFAULT_MIN_UPDATE_INTERVAL = 15
+DEFAULT_MAX_UPDATE_INTERVAL = 300
+
+# Consumption data and technical information update intervals in seconds, both
+# are updated on their own timer, independent of the dashboard
+DEFAULT_CONSUMPTION_UPDATE_INTERVAL = 15 * 60
+DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL = 7 * 24 * 60 * 60
+
+# Time in seconds before the end of an update interval at which data is
+# considered outdated, so a timer firing slightly early does not skip an update
+UPDATE_DUE_MARGIN = 15
+
+# Time in seconds during which the minimum update interval is used after a
+# command was sent or before a scheduled switch takes place
+FAST_UPDATE_WINDOW = 120
+
+# Time in seconds during which a setpoint command can be superseded by a newer one
+COMMAND_COALESCE_WINDOW = 1
+
+# Time in seconds to wait after the last command before verifying its result
+COMMAND_VERIFY_DELAY = 5
+
+# Time in seconds to wait after a scheduled switch before updating
+SWITCH_SETTLE_TIME = 30
+
+# Timeout in seconds for a single API request made by the coordinator
+REQUEST_TIMEOUT = 30
+
+# Time in seconds before the access token expires to refresh it in the background
+DEFAULT_TOKEN_REFRESH_MARGIN = 300
+
+# Minimum time in seconds between background access token refresh attempts
+TOKEN_REFRESH_RETRY_DELAY = 60
+
+# Number of attempts of an API request that failed or was rate limited
+MAX_REQUEST_ATTEMPTS = 3
+
+# Base delay in seconds of the exponential backoff between attempts
+RETRY_BACKOFF = 1
+
+# Longest Retry-After in seconds that is waited for before retrying a request,
+# longer delays open the circuit breaker instead
+MAX_RETRY_AFTER = 20
+
+# Consecutive failed requests after which the circuit breaker opens
+CIRCUIT_BREAKER_THRESHOLD = 5
+
+# Time in seconds the circuit breaker stays open before sending a trial request
+CIRCUIT_BREAKER_RESET_TIMEOUT = 120
+
+# Service capturing a profile of a number of refresh cycles
+SERVICE_CAPTURE_PROFILE = "capture_profile"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 5
+MAX_PROFILE_CYCLES = 50
+
+# Service applying modes and setpoints to several climate zones at once
+SERVICE_APPLY_SCENE = "apply_scene"
+ATTR_ZONES = "zones"
+
+# Number of functions and allocations listed in a profile report
+PROFILE_REPORT_LINES = 40
+
+# Windows in seconds of the heating rate and duty cycle, and of the coefficient
+# of performance
+HEATING_WINDOW = 60 * 60
+COP_WINDOW = 24 * 60 * 60
+
+# Number of samples kept per analytics window
+ANALYTICS_BUFFER_SIZE = 256
+
+# Longest time in seconds between samples that is counted in the analytics
+ANALYTICS_MAX_GAP = 15 * 60
+
+# Upper bounds in seconds of the buckets of the request latency histograms
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Record the API traffic to a log in the configuration directory by default
+DEFAULT_RECORD_TRAFFIC = False
+
+# Size in bytes after which the traffic log is rotated, and the number of
+# rotated logs that is kept
+TRAFFIC_LOG_MAX_BYTES = 5 * 1024 * 1024
+TRAFFIC_LOG_BACKUP_COUNT = 2
+
+# Response headers that are recorded, as the coordinator depends on them
+TRAFFIC_RECORDED_HEADERS = ("ETag", "Last-Modified", "Retry-After")
+
+# Keys of personal values that are removed from recorded traffic
+TRAFFIC_REDACTED_KEYS = {
+    "houseName",
+    "serialNumber",
+    "macAddress",
+    "ipAddress",
+    "email",
+    "address",
+    "zipCode",
+    "city",
+    "latitude",
+    "longitude",
+}
+
+# Keys of ids that are replaced by pseudonyms in recorded traffic
+TRAFFIC_PSEUDONYMIZED_KEYS = {
+    "applianceId",
+    "climateZoneId",
+    "hotWaterZoneId",
+    "gatewayId",
+    "deviceId",
+}
+
+STORAGE_VERSION = 1
+STORAGE_KEY_TECHNICAL_INFO = DOMAIN + ".{entry_id}.technical_info"
+STORAGE_KEY_DASHBOARD = DOMAIN + ".{entry_id}.dashboard"
+STORAGE_KEY_ENERGY_BACKFILL = DOMAIN + ".{entry_id}.energy_backfill"
+STORAGE_KEY_SCHEDULES = DOMAIN + ".{entry_id}.schedules"
+
+# Time in seconds to wait before writing changed data to storage
+STORAGE_SAVE_DELAY = 10
+
+# Import the historical consumption of appliances as long-term statistics
+DEFAULT_ENERGY_BACKFILL = False
+
+# Number of days of historical consumption requested at once, and in total
+BACKFILL_CHUNK_DAYS = 31
+BACKFILL_MAX_DAYS = 5 * 365
+
+# Time in seconds between checks for new days of consumption to import
+BACKFILL_INTERVAL = 6 * 60 * 60
+
 APPLIANCE_SENSOR_TYPES = [
     SensorEntityDescription(
         key="waterPressure",
@@ -176,6 +335,30 @@ CLIMATE_ZONE_SENSOR_TYPES = [
     ),
 ]
 
+# Sensors of the thermal analytics, the key is a ThermalAnalytics method
+CLIMATE_ZONE_ANALYTICS_SENSOR_TYPES = [
+    SensorEntityDescription(
+        key="heating_rate",
+        name="Heating Rate",
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="duty_cycle",
+        name="Heating Duty Cycle",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+]
+
+COP_SENSOR_TYPES = [
+    SensorEntityDescription(
+        key="cop",
+        name="Coefficient of Performance",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+]
+
 HOT_WATER_ZONE_SENSOR_TYPES = [
     SensorEntityDescription(
         key="dhwTemperature",
@@ -191,6 +374,45 @@ HOT_WATER_ZONE_SENSOR_TYPES = [
     ),
 ]
 
+# Sensors of the request metrics of an account, the key is a RequestMetrics property
+API_METRIC_SENSOR_TYPES = [
+    SensorEntityDescription(
+        key="requests_last_hour",
+        name="API Requests Last Hour",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="mean_latency",
+        name="API Mean Latency",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="slowest_endpoint",
+        name="API Slowest Endpoint",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="bytes_received",
+        name="API Data Received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="retries",
+        name="API Retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+]
+
 CLIMATE_ZONE_BINARY_SENSOR_TYPES = [
     (
         BinarySensorEntityDescription(
@@ -0,0 +1,25 @@
+"""Selection of the day of which the consumption data is requested."""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+
+
+def consumption_period(
+    previous_request: datetime | None, now: datetime
+) -> tuple[datetime, datetime]:
+    """Return the start and end of the day to request the consumption of.
+
+    The daily endpoint returns a single bucket with the consumption of the whole
+    day, so the consumption of today is requested. When the previous request was
+    made yesterday, the first request of today completes yesterday instead. This
+    publishes the consumption of the last interval before midnight, and the data
+    starts again from today on the next request.
+    """
+    start_of_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = start_of_today
+    if (
+        previous_request is not None
+        and previous_request.date() == (start_of_today - timedelta(days=1)).date()
+    ):
+        start = start_of_today - timedelta(days=1)
+    return start, start + timedelta(hours=23, minutes=59, seconds=59)
@@ -1,52 +1,203 @@
 """Coordinator for fetching the Remeha Home data."""
 
+from collections import defaultdict
+from collections.abc import Coroutine
 from datetime import datetime, timedelta
 import logging
+import time
+from typing import Any, TypeVar
 
 import asyncio
-from aiohttp.client_exceptions import ClientResponseError
+from aiohttp.client_exceptions import ClientError, ClientResponseError
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryAuthFailed
+import homeassistant.util.dt as dt_util
 
+from .analytics import ThermalAnalytics
 from .api import RemehaHomeAPI
-from .const import DOMAIN
+from .const import (
+    COMMAND_COALESCE_WINDOW,
+    COMMAND_VERIFY_DELAY,
+    DEFAULT_CONDITIONAL_DASHBOARD,
+    DEFAULT_CONSUMPTION_UPDATE_INTERVAL,
+    DEFAULT_MAX_PARALLEL_REQUESTS,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    FAST_UPDATE_WINDOW,
+    REQUEST_TIMEOUT,
+    STORAGE_KEY_DASHBOARD,
+    STORAGE_KEY_SCHEDULES,
+    STORAGE_KEY_TECHNICAL_INFO,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    SWITCH_SETTLE_TIME,
+    UPDATE_DUE_MARGIN,
+)
+from .consumption import consumption_period
+from .helpers import parse_timestamp
+from .models import (
+    EMPTY_CONSUMPTION_DATA,
+    Appliance,
+    ClimateZone,
+    HotWaterZone,
+    Producer,
+    RemehaHomeModel,
+)
+from .schedule import ScheduleCache
 
 _LOGGER = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=RemehaHomeModel)
+
+# Technical information used until the real information could be requested
+UNKNOWN_TECHNICAL_INFO = {
+    "applianceName": "Unknown",
+    "internetConnectedGateways": [],
+}
+
 
 class RemehaHomeUpdateCoordinator(DataUpdateCoordinator):
     """Remeha Home update coordinator."""
 
-    def __init__(self, hass: HomeAssistant, api: RemehaHomeAPI) -> None:
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: RemehaHomeAPI,
+        max_parallel_requests: int = DEFAULT_MAX_PARALLEL_REQUESTS,
+        conditional_dashboard: bool = DEFAULT_CONDITIONAL_DASHBOARD,
+        update_interval: timedelta = timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
+        min_update_interval: timedelta = timedelta(seconds=DEFAULT_MIN_UPDATE_INTERVAL),
+        max_update_interval: timedelta = timedelta(seconds=DEFAULT_MAX_UPDATE_INTERVAL),
+        consumption_update_interval: timedelta = timedelta(
+            seconds=DEFAULT_CONSUMPTION_UPDATE_INTERVAL
+        ),
+        technical_info_update_interval: timedelta = timedelta(
+            seconds=DEFAULT_TECHNICAL_INFO_UPDATE_INTERVAL
+        ),
+        poll_offset: timedelta = timedelta(0),
+    ) -> None:
         """Initialize Remeha Home update coordinator."""
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),
+            update_interval=update_interval,
+            # The models are updated in place, async_update_listeners only
+            # notifies the listeners of the items that changed
+            always_update=True,
         )
         self.api = api
-        self.items = {}
+        self.appliances: dict[str, Appliance] = {}
+        self.items: dict[str, RemehaHomeModel] = {}
         self.device_info = {}
+        self._device_metadata: dict[str, dict] = {}
         self.technical_info = {}
+        self._technical_info_updated: dict[str, float] = {}
+        self._technical_info_store = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_TECHNICAL_INFO.format(entry_id=config_entry.entry_id),
+        )
+        self._technical_info_update_interval = technical_info_update_interval
+        self._dashboard_store = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_DASHBOARD.format(entry_id=config_entry.entry_id),
+        )
+        self.schedules = ScheduleCache()
+        self._schedule_store = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_SCHEDULES.format(entry_id=config_entry.entry_id),
+        )
+        self.stale = False
         self.appliance_consumption_data = {}
         self.appliance_last_consumption_data_update = {}
+        self._consumption_update_interval = consumption_update_interval
+        self.refresh_timings = {}
+        # Shared with the API, which records the fetch and parse of the dashboard
+        self.spans = api.spans
+        self.analytics = ThermalAnalytics()
+        self.unchanged_dashboard_count = 0
+        self.suppressed_update_count = 0
+        self._changed_items: set[str] | None = None
+        self._listeners_notified_success = True
+        self._request_semaphore = asyncio.Semaphore(max_parallel_requests)
+        self._conditional_dashboard = conditional_dashboard
+        self._active_update_interval = update_interval
+        self._min_update_interval = min(min_update_interval, update_interval)
+        self._max_update_interval = max(update_interval, max_update_interval)
+        self._poll_offset = poll_offset
+        self._last_command: float | None = None
+        self._comfort_demands = {}
+        self.rejected_command_count = 0
+        self.superseded_command_count = 0
+        self._command_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._coalesce_generations: dict[tuple[str, frozenset], int] = {}
+        self._expected_changes: dict[str, dict] = {}
+        # Values of items reported or accepted by the server, while optimistic
+        # changes of the items are not verified yet
+        self._server_states: dict[str, dict[str, Any]] = {}
+        self._verify_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=COMMAND_VERIFY_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
 
-    async def _async_update_data(self):
+        # The consumption data and technical information are requested by their
+        # own coordinators, so they never delay the dashboard update
+        self.consumption_coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} consumption",
+            update_interval=consumption_update_interval,
+            update_method=self._async_update_outdated_consumption_data,
+        )
+        self.technical_info_coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} technical information",
+            update_interval=technical_info_update_interval,
+            update_method=self._async_update_outdated_technical_information,
+        )
+        for coordinator in (
+            self.consumption_coordinator,
+            self.technical_info_coordinator,
+        ):
+            coordinator.async_add_listener(self._async_details_updated)
+
+    async def _async_update_data(self) -> list[Appliance]:
         """Fetch data from API endpoint.
 
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
+        The dashboard is parsed into the appliance and zone models, which are
+        updated in place so entities can quickly look up their data.
         """
+        refresh_start = time.monotonic()
+        self._changed_items = None
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with asyncio.timeout(30):
-                data = await self.api.async_get_dashboard()
-                _LOGGER.debug("Requested dashboard information: %s", data)
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                dashboard = await self.api.async_get_dashboard(
+                    conditional=self._conditional_dashboard and self.data is not None
+                )
         except ClientResponseError as err:
             # Raising ConfigEntryAuthFailed will cancel future updates
             # and start a config flow with SOURCE_REAUTH (async_step_reauth)
@@ -57,165 +208,768 @@ class RemehaHomeUpdateCoordinator(DataUpdateCoordinator):
 
         # Save the current time for appliance usage data updates
         now = datetime.now()
+        dashboard_done = time.monotonic()
 
-        for appliance in data["appliances"]:
-            appliance_id = appliance["applianceId"]
-            self.items[appliance_id] = appliance
-
-            # Request appliance technical information the first time it is discovered
-            if appliance_id not in self.technical_info:
-                self.technical_info[appliance_id] = (
-                    await self.api.async_get_appliance_technical_information(
-                        appliance_id
-                    )
+        if dashboard is None:
+            # The dashboard did not change, skip processing unless details of
+            # a new appliance have to be requested
+            if not self._appliance_details_missing():
+                self.unchanged_dashboard_count += 1
+                # Time passed, which changes the rolling analytics
+                self._changed_items = self.analytics.update(
+                    self.appliances.values(), time.monotonic()
                 )
-                _LOGGER.debug(
-                    "Requested technical information for appliance %s: %s",
-                    appliance_id,
-                    self.technical_info[appliance_id],
+                self.update_interval = self._next_update_interval()
+                return self.data
+            changed_items = set()
+        else:
+            with self.spans.span("model_build"):
+                changed_items = self._process_dashboard(dashboard)
+            self._observe_schedules()
+
+        processing_done = time.monotonic()
+
+        # Request the missing technical information and consumption data of new
+        # appliances concurrently, a slow or failing appliance should not delay
+        # the others. Known appliances are updated by the detail coordinators.
+        appliances = list(self.appliances.values())
+        appliance_timings = {}
+        failed_appliances = []
+        results = await asyncio.gather(
+            *(
+                self._async_update_appliance_details(appliance, now, appliance_timings)
+                for appliance in appliances
+            ),
+            return_exceptions=True,
+        )
+        for appliance, result in zip(appliances, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "Failed to update details for appliance %s: %s",
+                    appliance.appliance_id,
+                    result,
                 )
+            if result is not True:
+                failed_appliances.append(appliance.appliance_id)
 
-            # Only update appliance usage data every 15 minutes
-            if (appliance_id not in self.appliance_last_consumption_data_update) or (
-                now - self.appliance_last_consumption_data_update[appliance_id]
-                >= timedelta(minutes=14, seconds=45)
-            ):
-                try:
-                    consumption_data = (
-                        await self.api.async_get_consumption_data_for_today(
-                            appliance_id
-                        )
-                    )
-                    _LOGGER.debug(
-                        "Requested consumption data for appliance %s: %s",
-                        appliance_id,
-                        consumption_data,
-                    )
+        with self.spans.span("model_build"):
+            changed_items |= self._process_appliance_details()
+        with self.spans.span("analytics"):
+            changed_items |= self.analytics.update(appliances, time.monotonic())
 
-                    if len(consumption_data["data"]) > 0:
-                        if consumption_data["data"][0]["producerPerformanceStatistics"]["producers"]:
-                            for producer in consumption_data["data"][0]["producerPerformanceStatistics"]["producers"]:
-                                if producer["energyType"] == "NaturalGas":
-                                    """Recalculate energy values back to gas values when Gas device"""
+        details_done = time.monotonic()
+        self.refresh_timings = {
+            "dashboard": round(dashboard_done - refresh_start, 3),
+            "processing": round(processing_done - dashboard_done, 3),
+            "appliance_details": round(details_done - processing_done, 3),
+            "total": round(details_done - refresh_start, 3),
+            "appliances": appliance_timings,
+            "failed_appliances": failed_appliances,
+        }
+        self._changed_items = changed_items
+        self.update_interval = self._next_update_interval()
 
-                                    producer["energyConsumptionCH"] = round(float(producer["energyConsumptionCH"]) / float(appliance["gasCalorificValue"]),2)
-                                    producer["energyConsumptionDHW"] = round(float(producer["energyConsumptionDHW"]) / float(appliance["gasCalorificValue"]),2)
+        if self.stale:
+            # Update all entities once, so none of them stays marked as stale
+            self.stale = False
+            self._changed_items = None
 
+        self._dashboard_store.async_delay_save(
+            self._dashboard_to_store, STORAGE_SAVE_DELAY
+        )
 
-                        self.appliance_consumption_data[appliance_id] = (
-                            consumption_data["data"][0]
-                        )
-                    else:
-                        _LOGGER.warning(
-                            "No consumption data found for appliance %s", appliance_id
-                        )
-                        self.appliance_consumption_data[appliance_id] = {
-                            "heatingEnergyConsumed": 0.0,
-                            "hotWaterEnergyConsumed": 0.0,
-                            "coolingEnergyConsumed": 0.0,
-                            "heatingEnergyDelivered": 0.0,
-                            "hotWaterEnergyDelivered": 0.0,
-                            "coolingEnergyDelivered": 0.0,
-                            "producerPerformanceStatistics": {
-                                "producers":[]
-                            }
-                        }
-
-                    self.appliance_last_consumption_data_update[appliance_id] = now
-                except ClientResponseError as err:
-                    _LOGGER.warning(
-                        "Failed to request consumption data for appliance %s: %s",
-                        appliance_id,
-                        err,
-                    )
+        return appliances
 
-            # Get the cached consumption data for the appliance or use default values
-            if appliance_id in self.appliance_consumption_data:
-                appliance["consumptionData"] = self.appliance_consumption_data[
-                    appliance_id
-                ]
-            else:
-                appliance["consumptionData"] = {
-                    "heatingEnergyConsumed": 0.0,
-                    "hotWaterEnergyConsumed": 0.0,
-                    "coolingEnergyConsumed": 0.0,
-                    "heatingEnergyDelivered": 0.0,
-                    "hotWaterEnergyDelivered": 0.0,
-                    "coolingEnergyDelivered": 0.0,
-                    "producerPerformanceStatistics": {
-                        "producers":[]
-                    }
-                }
+    def _observe_schedules(self) -> None:
+        """Add the next switches of the climate zones to the schedule cache."""
+        now = dt_util.now()
+        changed = False
+        for appliance in self.appliances.values():
+            for climate_zone in appliance.climate_zones:
+                changed |= self.schedules.observe(climate_zone, now)
+        if changed:
+            self._schedule_store.async_delay_save(
+                self.schedules.as_dict, STORAGE_SAVE_DELAY
+            )
+
+    @callback
+    def _async_details_updated(self) -> None:
+        """Apply the appliance details after they were updated."""
+        if self.data is None:
+            return
 
-            self.device_info[appliance_id] = DeviceInfo(
-                identifiers={(DOMAIN, appliance_id)},
-                name=appliance["houseName"],
-                manufacturer="Remeha",
-                model=self.technical_info[appliance_id]["applianceName"],
+        with self.spans.span("model_build"):
+            self._changed_items = self._process_appliance_details()
+        self._changed_items |= self.analytics.update(
+            self.appliances.values(), time.monotonic()
+        )
+        self._dashboard_store.async_delay_save(
+            self._dashboard_to_store, STORAGE_SAVE_DELAY
+        )
+        self.async_update_listeners()
+
+    def _process_dashboard(self, dashboard: dict) -> set[str]:
+        """Update the appliance and zone models from a dashboard.
+
+        Returns the ids of the items that changed since the previous dashboard,
+        including the items that are no longer on the dashboard.
+        """
+        changed_items = set()
+        previous_item_ids = {
+            item_id
+            for appliance in self.appliances.values()
+            for item_id in self._item_ids(appliance)
+        }
+        appliances = {}
+        for appliance_data in dashboard["appliances"]:
+            appliance_id = appliance_data["applianceId"]
+            appliance = self._update_item(
+                appliance_id, Appliance, appliance_data, changed_items
             )
+            appliance.climate_zones = [
+                self._update_item(
+                    climate_zone["climateZoneId"],
+                    ClimateZone,
+                    climate_zone,
+                    changed_items,
+                )
+                for climate_zone in appliance_data["climateZones"]
+            ]
+            appliance.hot_water_zones = [
+                self._update_item(
+                    hot_water_zone["hotWaterZoneId"],
+                    HotWaterZone,
+                    hot_water_zone,
+                    changed_items,
+                )
+                for hot_water_zone in appliance_data["hotWaterZones"]
+            ]
+            appliances[appliance_id] = appliance
 
-            for climate_zone in appliance["climateZones"]:
-                climate_zone_id = climate_zone["climateZoneId"]
-                # This assumes that all climate zones for an appliance share the same gateway
-                gateways = self.technical_info[appliance_id][
-                    "internetConnectedGateways"
-                ]
+        self.appliances = appliances
+        self._remove_items(
+            previous_item_ids.difference(
+                *(self._item_ids(appliance) for appliance in appliances.values())
+            ),
+            changed_items,
+        )
+        return changed_items
 
-                if len(gateways) > 1:
-                    _LOGGER.warning(
-                        "Appliance %s has more than one gateway, using technical information from the first one",
-                        appliance_id,
-                    )
+    @staticmethod
+    def _item_ids(appliance: Appliance) -> set[str]:
+        """Return the ids of an appliance and its zones and producers."""
+        return {
+            appliance.appliance_id,
+            *(zone.climate_zone_id for zone in appliance.climate_zones),
+            *(zone.hot_water_zone_id for zone in appliance.hot_water_zones),
+            *(
+                f"{appliance.appliance_id}_{producer.instance_within_device}"
+                for producer in appliance.producers
+            ),
+        }
 
-                if len(gateways) > 0:
-                    gateway_info = gateways[0]
-                else:
-                    _LOGGER.warning(
-                        "Appliance %s has no gateways, using unknown values",
-                        appliance_id,
-                    )
-                    gateway_info = {
-                        "name": "Unknown",
-                        "hardwareVersion": "Unknown",
-                        "softwareVersion": "Unknown",
-                    }
-
-                self.items[climate_zone_id] = climate_zone
-                self.device_info[climate_zone_id] = DeviceInfo(
-                    identifiers={(DOMAIN, climate_zone_id)},
-                    name=climate_zone["name"],
-                    manufacturer="Remeha",
+    def _remove_items(self, item_ids: set[str], changed_items: set[str]) -> None:
+        """Forget items that disappeared, so their entities become unavailable."""
+        for item_id in item_ids:
+            _LOGGER.debug("Removing %s, it is no longer on the dashboard", item_id)
+            self.items.pop(item_id, None)
+            self._expected_changes.pop(item_id, None)
+            self._server_states.pop(item_id, None)
+            changed_items.add(item_id)
+
+    def _process_appliance_details(self) -> set[str]:
+        """Apply the consumption data and technical information to the models.
+
+        Returns the ids of the items that changed.
+        """
+        changed_items = set()
+        for appliance_id, appliance in self.appliances.items():
+            # Get the cached consumption data for the appliance or use default values
+            consumption_data = self.appliance_consumption_data.get(
+                appliance_id, EMPTY_CONSUMPTION_DATA
+            )
+            if appliance.consumption_data != consumption_data:
+                appliance.consumption_data = consumption_data
+                changed_items.add(appliance_id)
+
+            producers = (
+                consumption_data.get("producerPerformanceStatistics") or {}
+            ).get("producers") or []
+            previous_producers = appliance.producers
+            # Only add producers when more then 1
+            appliance.producers = [
+                self._update_item(
+                    f"{appliance_id}_{producer['instanceWithinDevice']}",
+                    Producer,
+                    producer,
+                    changed_items,
+                )
+                for producer in (producers if len(producers) > 1 else [])
+            ]
+            self._remove_items(
+                {
+                    f"{appliance_id}_{producer.instance_within_device}"
+                    for producer in previous_producers
+                }
+                - {
+                    f"{appliance_id}_{producer.instance_within_device}"
+                    for producer in appliance.producers
+                },
+                changed_items,
+            )
+
+            technical_info = self.technical_info.get(
+                appliance_id, UNKNOWN_TECHNICAL_INFO
+            )
+            self._update_device_info(
+                appliance_id,
+                name=appliance.house_name,
+                model=technical_info["applianceName"],
+            )
+
+            gateway_info = self._gateway_info(appliance_id, technical_info)
+            for climate_zone in appliance.climate_zones:
+                self._update_device_info(
+                    climate_zone.climate_zone_id,
+                    name=climate_zone.name,
                     model=gateway_info["name"],
                     hw_version=gateway_info["hardwareVersion"],
                     sw_version=gateway_info["softwareVersion"],
                     via_device=(DOMAIN, appliance_id),
                 )
 
-            for hot_water_zone in appliance["hotWaterZones"]:
-                hot_water_zone_id = hot_water_zone["hotWaterZoneId"]
-                self.items[hot_water_zone_id] = hot_water_zone
-                self.device_info[hot_water_zone_id] = DeviceInfo(
-                    identifiers={(DOMAIN, hot_water_zone_id)},
-                    name=hot_water_zone["name"],
-                    manufacturer="Remeha",
+            for hot_water_zone in appliance.hot_water_zones:
+                self._update_device_info(
+                    hot_water_zone.hot_water_zone_id,
+                    name=hot_water_zone.name,
                     model="Hot Water Zone",
                     via_device=(DOMAIN, appliance_id),
                 )
 
-            if appliance["consumptionData"]["producerPerformanceStatistics"]:
-                if len(appliance["consumptionData"]["producerPerformanceStatistics"]["producers"]) >1:
-                    """Only add producers when more then 1"""
-                    for producer in appliance["consumptionData"]["producerPerformanceStatistics"]["producers"]:
-                        producer_id ="{0}_{1}".format(appliance_id,producer["instanceWithinDevice"])
-                        self.items[producer_id] = producer
-                        self.device_info[producer_id] = DeviceInfo(
-                            identifiers={(DOMAIN, producer_id)},
-                            name="{0}_{1}".format(producer["producerType"],producer["instanceWithinDevice"]),
-                            manufacturer="Remeha",
-                            model=producer["producerType"],
-                            via_device=(DOMAIN, appliance_id),
+            for producer in appliance.producers:
+                self._update_device_info(
+                    f"{appliance_id}_{producer.instance_within_device}",
+                    name=f"{producer.producer_type}_{producer.instance_within_device}",
+                    model=producer.producer_type,
+                    via_device=(DOMAIN, appliance_id),
+                )
+
+        return changed_items
+
+    @staticmethod
+    def _gateway_info(appliance_id: str, technical_info: dict) -> dict:
+        """Return the technical information of the gateway of an appliance."""
+        # This assumes that all climate zones for an appliance share the same gateway
+        gateways = technical_info["internetConnectedGateways"]
+
+        if len(gateways) > 1:
+            _LOGGER.warning(
+                "Appliance %s has more than one gateway, using technical information from the first one",
+                appliance_id,
+            )
+
+        if len(gateways) > 0:
+            return gateways[0]
+
+        _LOGGER.warning(
+            "Appliance %s has no gateways, using unknown values",
+            appliance_id,
+        )
+        return {
+            "name": "Unknown",
+            "hardwareVersion": "Unknown",
+            "softwareVersion": "Unknown",
+        }
+
+    def _update_device_info(self, device_id: str, **metadata: Any) -> None:
+        """Build the device info of a device, only when its metadata changed."""
+        if self._device_metadata.get(device_id) == metadata:
+            return
+
+        self._device_metadata[device_id] = metadata
+        self.device_info[device_id] = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            manufacturer="Remeha",
+            **metadata,
+        )
+
+    async def _async_update_appliance_details(
+        self, appliance: Appliance, now: datetime, timings: dict
+    ) -> bool:
+        """Request the missing technical information and consumption data of an appliance.
+
+        Returns whether all requests succeeded.
+        """
+        appliance_id = appliance.appliance_id
+        requests = []
+        if appliance_id not in self.technical_info:
+            requests.append(self._async_request_technical_information(appliance_id))
+        if appliance_id not in self.appliance_last_consumption_data_update:
+            requests.append(self._async_update_consumption_data(appliance, now))
+        if not requests:
+            return True
+
+        start = time.monotonic()
+        try:
+            return all(await asyncio.gather(*requests))
+        finally:
+            timings[appliance_id] = round(time.monotonic() - start, 3)
+
+    async def _async_update_outdated_technical_information(self) -> None:
+        """Request the technical information of all appliances that is outdated.
+
+        Cached technical information is used until it is older than the technical
+        information update interval.
+        """
+        if self.data is None:
+            return
+
+        outdated_after = (
+            self._technical_info_update_interval.total_seconds() - UPDATE_DUE_MARGIN
+        )
+        now = time.time()
+        await asyncio.gather(
+            *(
+                self._async_request_technical_information(appliance_id)
+                for appliance_id in self.appliances
+                if now - self._technical_info_updated.get(appliance_id, 0)
+                >= outdated_after
+            )
+        )
+
+    async def _async_request_technical_information(self, appliance_id: str) -> bool:
+        """Request the technical information of an appliance and cache it.
+
+        Returns whether the request succeeded, failures are logged.
+        """
+        try:
+            async with self._request_semaphore, asyncio.timeout(REQUEST_TIMEOUT):
+                with self.spans.span("technical_info"):
+                    technical_info = (
+                        await self.api.async_get_appliance_technical_information(
+                            appliance_id
                         )
-        return data
+                    )
+        except (ClientError, asyncio.TimeoutError) as err:
+            # Retry during the next update, until then unknown or cached values are used
+            _LOGGER.warning(
+                "Failed to request technical information for appliance %s: %s",
+                appliance_id,
+                err,
+            )
+            return False
+
+        self.technical_info[appliance_id] = technical_info
+        self._technical_info_updated[appliance_id] = time.time()
+        self._technical_info_store.async_delay_save(
+            self._technical_info_to_store, STORAGE_SAVE_DELAY
+        )
+        _LOGGER.debug(
+            "Requested technical information for appliance %s: %s",
+            appliance_id,
+            technical_info,
+        )
+        return True
+
+    async def async_load_cache(self) -> bool:
+        """Load the data cached during a previous run.
+
+        When a dashboard snapshot was stored, it is used as the current data and
+        marked as stale until the first successful update. Returns whether a
+        snapshot was restored.
+        """
+        if (stored := await self._schedule_store.async_load()) is not None:
+            self.schedules.load(stored)
+
+        if (stored := await self._technical_info_store.async_load()) is not None:
+            for appliance_id, cached in stored["appliances"].items():
+                self.technical_info[appliance_id] = cached["data"]
+                self._technical_info_updated[appliance_id] = cached["updated"]
+
+        if (stored := await self._dashboard_store.async_load()) is None:
+            return False
+
+        data = stored["data"]
+        for appliance in data["appliances"]:
+            # Keep the stored consumption data until it is requested again
+            self.appliance_consumption_data[appliance["applianceId"]] = appliance[
+                "consumptionData"
+            ]
+        self._process_dashboard(data)
+        self._process_appliance_details()
+        self.data = list(self.appliances.values())
+        self.stale = True
+        return True
+
+    @callback
+    def _dashboard_to_store(self) -> dict:
+        """Return the dashboard snapshot to store in the cache."""
+        return {
+            "data": {
+                "appliances": [
+                    appliance.as_dict() for appliance in self.appliances.values()
+                ]
+            }
+        }
+
+    @callback
+    def _technical_info_to_store(self) -> dict:
+        """Return the technical information to store in the cache."""
+        return {
+            "appliances": {
+                appliance_id: {
+                    "updated": self._technical_info_updated[appliance_id],
+                    "data": technical_info,
+                }
+                for appliance_id, technical_info in self.technical_info.items()
+            }
+        }
+
+    async def _async_update_outdated_consumption_data(self) -> None:
+        """Request the consumption data of all appliances that is outdated."""
+        if self.data is None:
+            return
+
+        now = datetime.now()
+        await asyncio.gather(
+            *(
+                self._async_update_consumption_data(appliance, now)
+                for appliance in self.appliances.values()
+                if self._consumption_data_update_due(appliance.appliance_id, now)
+            )
+        )
+
+    async def _async_update_consumption_data(
+        self, appliance: Appliance, now: datetime
+    ) -> bool:
+        """Request the consumption data of an appliance.
+
+        Returns whether the request succeeded, failures are logged.
+        """
+        appliance_id = appliance.appliance_id
+
+        try:
+            async with self._request_semaphore, asyncio.timeout(REQUEST_TIMEOUT):
+                with self.spans.span("consumption"):
+                    start, end = consumption_period(
+                        self.appliance_last_consumption_data_update.get(appliance_id),
+                        now,
+                    )
+                    consumption_data = await self.api.async_get_consumption_data(
+                        appliance_id, "daily", start, end
+                    )
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.warning(
+                "Failed to request consumption data for appliance %s: %s",
+                appliance_id,
+                err,
+            )
+            return False
+
+        _LOGGER.debug(
+            "Requested consumption data for appliance %s: %s",
+            appliance_id,
+            consumption_data,
+        )
+
+        if len(consumption_data["data"]) > 0:
+            with self.spans.span("gas_calorific"):
+                if consumption_data["data"][0]["producerPerformanceStatistics"]["producers"]:
+                    for producer in consumption_data["data"][0]["producerPerformanceStatistics"]["producers"]:
+                        if producer["energyType"] == "NaturalGas":
+                            """Recalculate energy values back to gas values when Gas device"""
+
+                            producer["energyConsumptionCH"] = round(float(producer["energyConsumptionCH"]) / float(appliance.gas_calorific_value),2)
+                            producer["energyConsumptionDHW"] = round(float(producer["energyConsumptionDHW"]) / float(appliance.gas_calorific_value),2)
+
+
+            self.appliance_consumption_data[appliance_id] = (
+                consumption_data["data"][0]
+            )
+        else:
+            _LOGGER.warning(
+                "No consumption data found for appliance %s", appliance_id
+            )
+            self.appliance_consumption_data[appliance_id] = EMPTY_CONSUMPTION_DATA
+
+        self.appliance_last_consumption_data_update[appliance_id] = now
+        return True
+
+    def _consumption_data_update_due(self, appliance_id: str, now: datetime) -> bool:
+        """Return whether the consumption data of an appliance is outdated."""
+        return (appliance_id not in self.appliance_last_consumption_data_update) or (
+            now - self.appliance_last_consumption_data_update[appliance_id]
+            >= self._consumption_update_interval
+            - timedelta(seconds=UPDATE_DUE_MARGIN)
+        )
+
+    def _appliance_details_missing(self) -> bool:
+        """Return whether any appliance details were never requested."""
+        return any(
+            appliance_id not in self.technical_info
+            or appliance_id not in self.appliance_last_consumption_data_update
+            for appliance_id in self.appliances
+        )
+
+    def _update_item(
+        self,
+        item_id: str,
+        model: type[ModelT],
+        data: dict,
+        changed_items: set,
+    ) -> ModelT:
+        """Update the model of an item and record whether it changed."""
+        item = self.items.get(item_id)
+        if item is None:
+            item = self.items[item_id] = model.from_dict(data)
+            changed_items.add(item_id)
+        elif item.update(data):
+            changed_items.add(item_id)
+        self._server_states.pop(item_id, None)
+
+        if (expected := self._expected_changes.pop(item_id, None)) is not None and any(
+            getattr(item, name) != value for name, value in expected.items()
+        ):
+            # The optimistic state is rolled back by storing the server state
+            _LOGGER.debug(
+                "Command result for %s was not confirmed, expected %s",
+                item_id,
+                expected,
+            )
+            self.rejected_command_count += 1
+
+        return item
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of the items that changed during the last update.
+
+        Listeners without an item id as context are always updated, all listeners
+        are updated when the update failed or the changes are unknown.
+        """
+        with self.spans.span("dispatch"):
+            self._async_dispatch_updates()
+
+    @callback
+    def _async_dispatch_updates(self) -> None:
+        """Call the listeners of the changed items, or all of them."""
+        changed_items, self._changed_items = self._changed_items, None
+        if (
+            changed_items is None
+            or not self.last_update_success
+            or not self._listeners_notified_success
+        ):
+            self._listeners_notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed_items:
+                update_callback()
+            else:
+                self.suppressed_update_count += 1
+
+    def _next_update_interval(self) -> timedelta:
+        """Determine the update interval based on the activity of the zones.
+
+        The minimum interval is used shortly after a command and around scheduled
+        switches or changes in comfort demand. The interval is doubled up to the
+        maximum interval while all climate zones are idle. The first interval is
+        extended by the poll offset, so config entries that are set up together
+        spread their updates.
+        """
+        fast_window = timedelta(seconds=FAST_UPDATE_WINDOW)
+        now = dt_util.utcnow()
+        fast = (
+            self._last_command is not None
+            and time.monotonic() - self._last_command < FAST_UPDATE_WINDOW
+        )
+        active = False
+        until_next_switch = None
+
+        for appliance in self.appliances.values():
+            for climate_zone in appliance.climate_zones:
+                demand = climate_zone.active_comfort_demand
+                previous_demand = self._comfort_demands.get(
+                    climate_zone.climate_zone_id, demand
+                )
+                self._comfort_demands[climate_zone.climate_zone_id] = demand
+                fast = fast or demand != previous_demand
+                active = active or demand != "Idle"
+
+            for zone in (*appliance.climate_zones, *appliance.hot_water_zones):
+                if isinstance(zone, ClimateZone):
+                    # Use the time program when the dashboard has no future switch
+                    next_switch_time = self.schedules.upcoming_switch(
+                        zone, now, fast_window
+                    )
+                elif (next_switch := zone.next_switch_time) is not None:
+                    next_switch_time = parse_timestamp(next_switch)
+                else:
+                    next_switch_time = None
+                if next_switch_time is None:
+                    continue
+                until_switch = next_switch_time - now
+                if -fast_window < until_switch <= fast_window:
+                    fast = True
+                elif until_switch > fast_window and (
+                    until_next_switch is None or until_switch < until_next_switch
+                ):
+                    until_next_switch = until_switch
+
+        if fast:
+            interval = self._min_update_interval
+        elif active:
+            interval = self._active_update_interval
+        else:
+            interval = self.update_interval * 2
+
+        # Update shortly after the next scheduled switch
+        if until_next_switch is not None:
+            interval = min(
+                interval, until_next_switch + timedelta(seconds=SWITCH_SETTLE_TIME)
+            )
+
+        interval = max(self._min_update_interval, min(interval, self._max_update_interval))
+        interval, self._poll_offset = interval + self._poll_offset, timedelta(0)
+        return interval
+
+    async def async_refresh_after_poll_offset(self) -> None:
+        """Refresh once the poll offset passed, instead of extending an interval."""
+        poll_offset, self._poll_offset = self._poll_offset, timedelta(0)
+        await asyncio.sleep(poll_offset.total_seconds())
+        await self.async_refresh()
+
+    async def async_send_command(
+        self,
+        item_id: str,
+        expected: dict[str, Any],
+        command: Coroutine,
+        coalesce: bool = False,
+        verify: bool = True,
+    ) -> None:
+        """Send a command and optimistically apply its expected result to an item.
+
+        The expected result maps model attribute names to their new values.
+        Commands for an item are sent one at a time in the order they were
+        requested. A coalescing command, like a setpoint change, is dropped when
+        another coalescing command changing the same keys of the item is requested
+        within a short window, so only the last value of a burst is sent.
+
+        The result is verified by a single update shortly after the last command,
+        which replaces the optimistic state with the state reported by the server.
+        When the command fails, the changed values are rolled back immediately
+        to the last values reported or accepted by the server, as earlier
+        optimistic values may have been dropped without being sent, and an
+        update is scheduled.
+        Without verify the caller is responsible for the verification update of
+        a successful command.
+        """
+        item = self.items[item_id]
+        previous = item.apply(expected)
+        server_state = self._server_states.setdefault(item_id, {})
+        for name, value in previous.items():
+            server_state.setdefault(name, value)
+        self._async_update_item_listeners(item_id)
+
+        if coalesce:
+            coalesce_key = (item_id, frozenset(expected))
+            generation = self._coalesce_generations.get(coalesce_key, 0) + 1
+            self._coalesce_generations[coalesce_key] = generation
+
+        try:
+            async with self._command_locks[item_id]:
+                if coalesce:
+                    await asyncio.sleep(COMMAND_COALESCE_WINDOW)
+                    if self._coalesce_generations[coalesce_key] != generation:
+                        _LOGGER.debug("Dropping superseded command for %s", item_id)
+                        self.superseded_command_count += 1
+                        return
+                await command
+        except Exception:
+            server_state = self._server_states.get(item_id, {})
+            item.apply(
+                {name: server_state.get(name, value) for name, value in previous.items()}
+            )
+            self._async_update_item_listeners(item_id)
+            await self._verify_debouncer.async_call()
+            raise
+        finally:
+            # Make sure a dropped or cancelled command is never left unawaited
+            command.close()
+
+        self._last_command = time.monotonic()
+        self._server_states.setdefault(item_id, {}).update(expected)
+        self._expected_changes.setdefault(item_id, {}).update(expected)
+        if verify:
+            await self._verify_debouncer.async_call()
+
+    async def async_send_commands(
+        self, commands: dict[str, tuple[dict[str, Any], Coroutine]]
+    ) -> dict[str, dict[str, Any]]:
+        """Send commands for several items concurrently and verify them at once.
+
+        The commands map item ids to the expected result and the command, like
+        for async_send_command. At most the maximum number of parallel requests
+        is sent at the same time, and a single update after the last command
+        verifies all of them. Returns per item whether the command was sent and
+        whether the server confirmed the expected result.
+        """
+
+        async def _async_send(
+            item_id: str, expected: dict[str, Any], command: Coroutine
+        ) -> None:
+            try:
+                async with self._request_semaphore:
+                    await self.async_send_command(
+                        item_id, expected, command, verify=False
+                    )
+            finally:
+                command.close()
+
+        item_ids = list(commands)
+        results = await asyncio.gather(
+            *(_async_send(item_id, *commands[item_id]) for item_id in item_ids),
+            return_exceptions=True,
+        )
+        if not all(isinstance(result, BaseException) for result in results):
+            # The update also verifies commands that are waiting for the debouncer
+            self._verify_debouncer.async_cancel()
+            await self.async_refresh()
+
+        outcome = {}
+        for item_id, result in zip(item_ids, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning("Command for %s failed: %s", item_id, result)
+                outcome[item_id] = {"success": False, "error": repr(result)}
+                continue
+            expected = commands[item_id][0]
+            item = self.items[item_id]
+            outcome[item_id] = {
+                "success": True,
+                # Unknown when the verification update failed
+                "confirmed": (
+                    all(getattr(item, name) == value for name, value in expected.items())
+                    if self.last_update_success
+                    else None
+                ),
+                "state": {name: getattr(item, name) for name in expected},
+            }
+        return outcome
+
+    @callback
+    def _async_update_item_listeners(self, item_id: str) -> None:
+        """Update the listeners of a single item."""
+        for update_callback, context in list(self._listeners.values()):
+            if context == item_id:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled command verification and detail updates."""
+        await super().async_shutdown()
+        self._verify_debouncer.async_shutdown()
+        await self.consumption_coordinator.async_shutdown()
+        await self.technical_info_coordinator.async_shutdown()
 
     def get_by_id(self, item_id: str):
         """Return item with the specified item id."""
@@ -0,0 +1,33 @@
+"""Diagnostics support for Remeha Home."""
+
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    backfill = hass.data[DOMAIN][entry.entry_id]["backfill"]
+
+    return {
+        "stale": coordinator.stale,
+        "refresh_timings": coordinator.refresh_timings,
+        "timing_spans": coordinator.spans.as_dict(),
+        "unchanged_dashboard_count": coordinator.unchanged_dashboard_count,
+        "suppressed_update_count": coordinator.suppressed_update_count,
+        "rejected_command_count": coordinator.rejected_command_count,
+        "superseded_command_count": coordinator.superseded_command_count,
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "token_refresh": api.token_refresh_statistics,
+        "circuit_breaker": api.circuit_breaker.as_dict(),
+        "requests": api.metrics.as_dict(),
+        "energy_backfill_watermarks": backfill.watermarks if backfill else None,
+    }
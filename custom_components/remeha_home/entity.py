@@ -0,0 +1,42 @@
+"""Base entity for the Remeha Home integration."""
+
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+
+def account_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device info of the service device of a Remeha Home account."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="Remeha",
+        model="Remeha Home",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+class RemehaHomeEntity(CoordinatorEntity):
+    """Base class for entities backed by the Remeha Home update coordinator."""
+
+    @property
+    def available(self) -> bool:
+        """Return whether the update succeeded and the item still exists.
+
+        Items that disappeared from the dashboard are removed by the coordinator,
+        entities without an item are always available after a successful update.
+        """
+        return super().available and getattr(self, "_data", True) is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark the state as stale while it is restored from the last dashboard."""
+        if self.coordinator.stale:
+            return {"stale": True}
+        return None
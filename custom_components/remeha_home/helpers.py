@@ -0,0 +1,73 @@
+"""Helpers for the Remeha Home integration."""
+
+from __future__ import annotations
+from collections.abc import Callable
+from datetime import datetime, tzinfo
+from email.utils import parsedate_to_datetime
+from functools import cache, lru_cache
+from operator import attrgetter
+import re
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+
+@cache
+def attribute_name(key: str) -> str:
+    """Return the model attribute name of an API key, like set_point for setPoint."""
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", key).lower()
+
+
+@cache
+def compile_key_path(key: str) -> Callable[[Any], Any]:
+    """Return a function that looks up a dotted key path in a model.
+
+    The first part of the path is the API key of a model attribute, the other
+    parts are keys in the dictionary stored in that attribute. The returned
+    function raises a KeyError when a part of the path is missing.
+    """
+    first, *parts = key.split(".")
+    get_attribute = attrgetter(attribute_name(first))
+    if not parts:
+        return get_attribute
+
+    def get_value(item: Any) -> Any:
+        data = get_attribute(item)
+        for part in parts:
+            data = data[part]
+        return data
+
+    return get_value
+
+
+@lru_cache(maxsize=256)
+def _parse_timestamp(value: str, time_zone: tzinfo) -> datetime | None:
+    """Parse a timestamp and assign it the supplied time zone."""
+    if (parsed := dt_util.parse_datetime(value)) is None:
+        return None
+    return parsed.replace(tzinfo=time_zone)
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    """Parse a timestamp in the default time zone, memoised per raw value."""
+    return _parse_timestamp(value, dt_util.DEFAULT_TIME_ZONE)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait from a Retry-After header, if it is valid.
+
+    The header contains either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return float(max(int(value), 0))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0.0)
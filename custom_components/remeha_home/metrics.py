@@ -0,0 +1,166 @@
+"""Metrics of the requests made to the Remeha Home API."""
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter, deque
+from functools import lru_cache
+import time
+
+from .const import LATENCY_BUCKETS
+
+# Path segments that are followed by the id of an item
+ID_COLLECTIONS = {"appliances", "climate-zones", "hot-water-zones", "heating"}
+
+
+@lru_cache(maxsize=64)
+def endpoint_name(method: str, path: str) -> str:
+    """Return the endpoint of a request, with the ids and query removed."""
+    segments = path.partition("?")[0].split("/")
+    for index in range(1, len(segments)):
+        if segments[index - 1] in ID_COLLECTIONS:
+            segments[index] = "{id}"
+    return f"{method} {'/'.join(segments)}"
+
+
+class EndpointMetrics:
+    """Latency histogram and counters of the requests to a single endpoint."""
+
+    __slots__ = (
+        "requests",
+        "statuses",
+        "bytes_received",
+        "retries",
+        "latency_buckets",
+        "latency_sum",
+        "latency_max",
+    )
+
+    def __init__(self) -> None:
+        """Create empty endpoint metrics."""
+        self.requests = 0
+        self.statuses: Counter[str] = Counter()
+        self.bytes_received = 0
+        self.retries = 0
+        # The last bucket counts the requests slower than the largest bound
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "latency_mean": (
+                round(self.latency_sum / self.requests, 3) if self.requests else None
+            ),
+            "latency_max": round(self.latency_max, 3),
+            "latency_histogram": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)
+                },
+                "slower": self.latency_buckets[-1],
+            },
+        }
+
+
+class RequestMetrics:
+    """Collect the metrics of the requests made by an API client per endpoint.
+
+    Every attempt counts as a request, so a retried request is counted once for
+    each attempt. Failed attempts without a response are counted with the
+    status "error".
+    """
+
+    def __init__(self) -> None:
+        """Create empty request metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self._request_times: deque[float] = deque()
+
+    def record_request(
+        self,
+        endpoint: str,
+        latency: float,
+        status: int | None,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record a single attempt of a request to an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+
+        metrics.requests += 1
+        metrics.statuses["error" if status is None else str(status)] += 1
+        metrics.bytes_received += bytes_received
+        metrics.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        metrics.latency_sum += latency
+        metrics.latency_max = max(metrics.latency_max, latency)
+
+        now = time.monotonic()
+        self._request_times.append(now)
+        self._expire_request_times(now)
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record that a request to an endpoint will be retried."""
+        self.endpoints[endpoint].retries += 1
+
+    def _expire_request_times(self, now: float) -> None:
+        """Forget the times of the requests made more than an hour ago."""
+        while self._request_times and self._request_times[0] < now - 3600:
+            self._request_times.popleft()
+
+    @property
+    def requests_last_hour(self) -> int:
+        """Return the number of requests made during the last hour."""
+        self._expire_request_times(time.monotonic())
+        return len(self._request_times)
+
+    @property
+    def requests(self) -> int:
+        """Return the total number of requests."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        """Return the total number of retried requests."""
+        return sum(metrics.retries for metrics in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the total number of bytes received."""
+        return sum(metrics.bytes_received for metrics in self.endpoints.values())
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean latency of all requests in seconds."""
+        if not (requests := self.requests):
+            return None
+        latency_sum = sum(metrics.latency_sum for metrics in self.endpoints.values())
+        return round(latency_sum / requests, 3)
+
+    @property
+    def slowest_endpoint(self) -> str | None:
+        """Return the endpoint with the highest mean latency."""
+        if not self.endpoints:
+            return None
+        return max(
+            self.endpoints,
+            key=lambda endpoint: self.endpoints[endpoint].latency_sum
+            / self.endpoints[endpoint].requests,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "requests_last_hour": self.requests_last_hour,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "mean_latency": self.mean_latency,
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in sorted(self.endpoints.items())
+            },
+        }
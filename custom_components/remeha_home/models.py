@@ -0,0 +1,148 @@
+"""Models of the appliances and zones in the Remeha Home dashboard."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field, fields
+from functools import cache
+from typing import Any, Self
+
+# Consumption data used for an appliance until it could be requested
+EMPTY_CONSUMPTION_DATA = {
+    "heatingEnergyConsumed": 0.0,
+    "hotWaterEnergyConsumed": 0.0,
+    "coolingEnergyConsumed": 0.0,
+    "heatingEnergyDelivered": 0.0,
+    "hotWaterEnergyDelivered": 0.0,
+    "coolingEnergyDelivered": 0.0,
+    "producerPerformanceStatistics": {"producers": []},
+}
+
+
+def api_field(key: str) -> Any:
+    """Return a model field that is read from the supplied API key."""
+    return field(default=None, metadata={"key": key})
+
+
+@cache
+def _api_fields(cls: type) -> tuple[tuple[str, str], ...]:
+    """Return the attribute names and API keys of the API fields of a model."""
+    return tuple(
+        (model_field.name, model_field.metadata["key"])
+        for model_field in fields(cls)
+        if "key" in model_field.metadata
+    )
+
+
+class RemehaHomeModel:
+    """Base class of a model that is updated in place from the API data."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """Create a model from the API data, any other keys are ignored."""
+        return cls(**{name: data.get(key) for name, key in _api_fields(cls)})
+
+    def update(self, data: dict) -> bool:
+        """Update the model from the API data and return whether it changed."""
+        changed = False
+        for name, key in _api_fields(type(self)):
+            value = data.get(key)
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed = True
+        return changed
+
+    def apply(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Set attributes by name and return their previous values."""
+        previous = {name: getattr(self, name) for name in values}
+        for name, value in values.items():
+            setattr(self, name, value)
+        return previous
+
+    def as_dict(self) -> dict:
+        """Return the model as API data."""
+        return {key: getattr(self, name) for name, key in _api_fields(type(self))}
+
+
+@dataclass(slots=True, eq=False)
+class ClimateZone(RemehaHomeModel):
+    """A climate zone of an appliance."""
+
+    climate_zone_id: str = api_field("climateZoneId")
+    name: str = api_field("name")
+    zone_mode: str = api_field("zoneMode")
+    room_temperature: float | None = api_field("roomTemperature")
+    set_point: float | None = api_field("setPoint")
+    set_point_min: float = api_field("setPointMin")
+    set_point_max: float = api_field("setPointMax")
+    active_comfort_demand: str = api_field("activeComfortDemand")
+    active_heating_climate_time_program_number: int = api_field(
+        "activeHeatingClimateTimeProgramNumber"
+    )
+    fire_place_mode_active: bool = api_field("firePlaceModeActive")
+    next_setpoint: float | None = api_field("nextSetpoint")
+    next_switch_time: str | None = api_field("nextSwitchTime")
+    current_schedule_set_point: float | None = api_field("currentScheduleSetPoint")
+
+
+@dataclass(slots=True, eq=False)
+class HotWaterZone(RemehaHomeModel):
+    """A hot water zone of an appliance."""
+
+    hot_water_zone_id: str = api_field("hotWaterZoneId")
+    name: str = api_field("name")
+    dhw_zone_mode: str = api_field("dhwZoneMode")
+    dhw_status: str = api_field("dhwStatus")
+    dhw_temperature: float | None = api_field("dhwTemperature")
+    target_setpoint: float | None = api_field("targetSetpoint")
+    comfort_set_point: float | None = api_field("comfortSetPoint")
+    reduced_setpoint: float | None = api_field("reducedSetpoint")
+    set_point_min: float = api_field("setPointMin")
+    set_point_max: float = api_field("setPointMax")
+    set_point_ranges: dict = api_field("setPointRanges")
+    next_switch_time: str | None = api_field("nextSwitchTime")
+
+
+@dataclass(slots=True, eq=False)
+class Producer(RemehaHomeModel):
+    """A heat producer of an appliance, like a boiler or a heat pump."""
+
+    producer_type: str = api_field("producerType")
+    instance_within_device: int = api_field("instanceWithinDevice")
+    energy_type: str = api_field("energyType")
+    energy_consumption_ch: float | None = api_field("energyConsumptionCH")
+    energy_consumption_dhw: float | None = api_field("energyConsumptionDHW")
+    energy_consumption_cooling: float | None = api_field("energyConsumptionCooling")
+    energy_production_ch: float | None = api_field("energyProductionCH")
+    energy_production_dhw: float | None = api_field("energyProductionDHW")
+    energy_production_cooling: float | None = api_field("energyProductionCooling")
+
+
+@dataclass(slots=True, eq=False)
+class Appliance(RemehaHomeModel):
+    """An appliance with its zones, producers and consumption data.
+
+    Only the fields of the appliance itself are updated from the dashboard, the
+    zones and producers are separate models maintained by the coordinator.
+    """
+
+    appliance_id: str = api_field("applianceId")
+    house_name: str = api_field("houseName")
+    gas_calorific_value: float | None = api_field("gasCalorificValue")
+    water_pressure: float | None = api_field("waterPressure")
+    outdoor_temperature_information: dict | None = api_field(
+        "outdoorTemperatureInformation"
+    )
+    consumption_data: dict = field(default_factory=lambda: EMPTY_CONSUMPTION_DATA)
+    climate_zones: list[ClimateZone] = field(default_factory=list)
+    hot_water_zones: list[HotWaterZone] = field(default_factory=list)
+    producers: list[Producer] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        """Return the appliance, its zones and consumption data as API data."""
+        return {
+            **RemehaHomeModel.as_dict(self),
+            "consumptionData": self.consumption_data,
+            "climateZones": [zone.as_dict() for zone in self.climate_zones],
+            "hotWaterZones": [zone.as_dict() for zone in self.hot_water_zones],
+        }
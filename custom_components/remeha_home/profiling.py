@@ -0,0 +1,157 @@
+"""Timing spans and profile captures of the Remeha Home refresh pipeline."""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+import cProfile
+from datetime import datetime
+import io
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from .const import PROFILE_REPORT_LINES
+
+if TYPE_CHECKING:
+    from .coordinator import RemehaHomeUpdateCoordinator
+
+
+class TimingSpans:
+    """Durations of the named stages of the refresh pipeline.
+
+    Stages that run concurrently, like the requests for several appliances, are
+    recorded separately, so their durations overlap.
+    """
+
+    def __init__(self) -> None:
+        """Create empty timing spans."""
+        # Count, total, maximum and last duration of every span
+        self._spans: dict[str, list[float]] = {}
+        self._captures: list[TimingSpans] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Record the duration of the enclosed code as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, duration: float) -> None:
+        """Record a single duration of a span."""
+        if (span := self._spans.get(name)) is None:
+            self._spans[name] = [1, duration, duration, duration]
+        else:
+            span[0] += 1
+            span[1] += duration
+            span[2] = max(span[2], duration)
+            span[3] = duration
+
+        for capture in self._captures:
+            capture.record(name, duration)
+
+    @contextmanager
+    def capture(self) -> Iterator[TimingSpans]:
+        """Return spans that also receive every span recorded until exit."""
+        captured = TimingSpans()
+        self._captures.append(captured)
+        try:
+            yield captured
+        finally:
+            self._captures.remove(captured)
+
+    def as_dict(self) -> dict:
+        """Return the statistics of every span in seconds."""
+        return {
+            name: {
+                "count": count,
+                "mean": round(total / count, 4),
+                "max": round(maximum, 4),
+                "last": round(last, 4),
+            }
+            for name, (count, total, maximum, last) in sorted(self._spans.items())
+        }
+
+
+async def async_capture_profile(
+    coordinator: RemehaHomeUpdateCoordinator, cycles: int
+) -> tuple[list[float], TimingSpans, cProfile.Profile, list[tracemalloc.Snapshot]]:
+    """Profile the supplied number of refresh cycles of a coordinator.
+
+    Returns the latency of every cycle, the spans recorded during the cycles,
+    the profiler and the memory snapshots taken before and after the cycles.
+    The profiler only runs during the refreshes, but it also measures other
+    tasks that run on the event loop at the same time.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    latencies = []
+    try:
+        before = tracemalloc.take_snapshot()
+        with coordinator.spans.capture() as spans:
+            for _ in range(cycles):
+                start = time.perf_counter()
+                profiler.enable()
+                try:
+                    await coordinator.async_refresh()
+                finally:
+                    profiler.disable()
+                latencies.append(time.perf_counter() - start)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    return latencies, spans, profiler, [before, after]
+
+
+def write_profile_report(
+    directory: Path,
+    name: str,
+    latencies: list[float],
+    spans: TimingSpans,
+    profiler: cProfile.Profile,
+    snapshots: list[tracemalloc.Snapshot],
+) -> tuple[Path, Path]:
+    """Write a text report and the cProfile statistics, return their paths.
+
+    This does blocking I/O and must run in the executor.
+    """
+    stats = pstats.Stats(profiler)
+    before, after = snapshots
+    allocations = after.compare_to(before, "lineno")
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"profile_{name}_{datetime.now():%Y%m%d_%H%M%S}"
+    report_path = directory / f"{stem}.txt"
+    stats_path = directory / f"{stem}.prof"
+    stats.dump_stats(stats_path)
+
+    cumulative = io.StringIO()
+    stats.stream = cumulative
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_LINES)
+
+    lines = [
+        f"Refresh cycles: {len(latencies)}",
+        "Refresh latency: "
+        + ", ".join(f"{latency * 1000:.1f} ms" for latency in latencies),
+        "",
+        "Timing spans:",
+        *(
+            f"  {name:<16} count {span['count']:4d}  mean {span['mean'] * 1000:8.1f} ms"
+            f"  max {span['max'] * 1000:8.1f} ms"
+            for name, span in spans.as_dict().items()
+        ),
+        "",
+        "Largest memory allocation differences:",
+        *(f"  {allocation}" for allocation in allocations[:PROFILE_REPORT_LINES]),
+        "",
+        "Profile by cumulative time:",
+        cumulative.getvalue(),
+    ]
+    report_path.write_text("\n".join(lines), encoding="utf-8")
+    return report_path, stats_path
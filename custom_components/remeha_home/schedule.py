@@ -0,0 +1,161 @@
+"""Cache of the heating time programs of climate zones."""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+from itertools import pairwise
+
+import homeassistant.util.dt as dt_util
+
+from .helpers import parse_timestamp
+from .models import ClimateZone
+
+MINUTES_PER_WEEK = 7 * 24 * 60
+
+
+def _minute_of_week(timestamp: datetime) -> int:
+    """Return the minute of the week of a local timestamp, from Monday 00:00."""
+    return timestamp.weekday() * 24 * 60 + timestamp.hour * 60 + timestamp.minute
+
+
+class ScheduleCache:
+    """Switch points of the heating time programs of climate zones.
+
+    The API does not offer the time programs, but every dashboard contains the
+    next switch of the active time program of a zone. These switches are
+    collected per time program, so the cache completes itself within a week
+    without extra requests. A cached switch point is replaced when the dashboard
+    shows another setpoint at that time, and removed when the dashboard skips
+    over it, so changes to a time program are picked up as they are observed.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty schedule cache."""
+        # Setpoint per minute of the week, per time program, per climate zone
+        self._programs: dict[str, dict[int, dict[int, float]]] = {}
+
+    def observe(self, climate_zone: ClimateZone, now: datetime) -> bool:
+        """Add the next switch of a climate zone and return whether it changed."""
+        program_number = climate_zone.active_heating_climate_time_program_number
+        if (
+            program_number is None
+            or climate_zone.next_setpoint is None
+            or climate_zone.next_switch_time is None
+            or (switch_time := parse_timestamp(climate_zone.next_switch_time)) is None
+            or switch_time <= now
+        ):
+            return False
+
+        program = self._programs.setdefault(
+            climate_zone.climate_zone_id, {}
+        ).setdefault(program_number, {})
+        changed = False
+
+        # The dashboard shows the first switch after now, so cached switch
+        # points before it no longer exist in the time program
+        now_minute = _minute_of_week(dt_util.as_local(now))
+        switch_minute = _minute_of_week(switch_time)
+        skipped = (switch_minute - now_minute) % MINUTES_PER_WEEK
+        for minute in list(program):
+            if 0 < (minute - now_minute) % MINUTES_PER_WEEK < skipped:
+                del program[minute]
+                changed = True
+
+        if program.get(switch_minute) != climate_zone.next_setpoint:
+            program[switch_minute] = climate_zone.next_setpoint
+            changed = True
+        return changed
+
+    def switches(
+        self, climate_zone: ClimateZone, start: datetime, end: datetime
+    ) -> list[tuple[datetime, datetime, float]]:
+        """Return the predicted setpoints of the active time program of a zone.
+
+        Every setpoint lasts from its switch until the next switch, the returned
+        periods overlap the supplied start and end.
+        """
+        program = self._programs.get(climate_zone.climate_zone_id, {}).get(
+            climate_zone.active_heating_climate_time_program_number
+        )
+        if not program:
+            return []
+
+        points = sorted(program.items())
+        local_start = dt_util.as_local(start)
+        # Start a week early, as the setpoint at the start switched before it
+        week_start = (local_start - timedelta(days=local_start.weekday() + 7)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        switch_times = []
+        while week_start <= end:
+            switch_times.extend(
+                (week_start + timedelta(minutes=minute), setpoint)
+                for minute, setpoint in points
+            )
+            week_start += timedelta(weeks=1)
+        # The last period ends at the first switch of the following week
+        switch_times.append(
+            (week_start + timedelta(minutes=points[0][0]), points[0][1])
+        )
+
+        return [
+            (switch_time, next_switch_time, setpoint)
+            for (switch_time, setpoint), (next_switch_time, _) in pairwise(
+                switch_times
+            )
+            if next_switch_time > start and switch_time < end
+        ]
+
+    def next_switch(
+        self, climate_zone: ClimateZone, now: datetime
+    ) -> tuple[datetime, float] | None:
+        """Return the time and setpoint of the next predicted switch of a zone."""
+        for switch_time, _, setpoint in self.switches(
+            climate_zone, now, now + timedelta(weeks=1)
+        ):
+            if switch_time > now:
+                return switch_time, setpoint
+        return None
+
+    def upcoming_switch(
+        self, climate_zone: ClimateZone, now: datetime, grace: timedelta
+    ) -> datetime | None:
+        """Return the next switch of a zone from its dashboard or the cache.
+
+        The switch in the dashboard is used until it is more than the grace
+        period in the past, after that the predicted switch is returned. Both
+        are read as local wall time by parse_timestamp.
+        """
+        if (
+            climate_zone.next_switch_time is not None
+            and (switch_time := parse_timestamp(climate_zone.next_switch_time))
+            is not None
+            and switch_time > now - grace
+        ):
+            return switch_time
+        if (predicted := self.next_switch(climate_zone, now)) is None:
+            return None
+        return predicted[0]
+
+    def as_dict(self) -> dict:
+        """Return the cached time programs for storage."""
+        return {
+            climate_zone_id: {
+                str(program_number): {
+                    str(minute): setpoint for minute, setpoint in program.items()
+                }
+                for program_number, program in programs.items()
+            }
+            for climate_zone_id, programs in self._programs.items()
+        }
+
+    def load(self, data: dict) -> None:
+        """Load time programs stored using as_dict."""
+        self._programs = {
+            climate_zone_id: {
+                int(program_number): {
+                    int(minute): setpoint for minute, setpoint in program.items()
+                }
+                for program_number, program in programs.items()
+            }
+            for climate_zone_id, programs in data.items()
+        }
@@ -10,21 +10,28 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-import homeassistant.util.dt as dt_util
 
 from .const import (
+    API_METRIC_SENSOR_TYPES,
     APPLIANCE_SENSOR_TYPES,
+    CLIMATE_ZONE_ANALYTICS_SENSOR_TYPES,
     CLIMATE_ZONE_SENSOR_TYPES,
+    COP_SENSOR_TYPES,
     DOMAIN,
     HOT_WATER_ZONE_SENSOR_TYPES,
     GAS_PRODUCER_SENSOR_TYPES,
     ELECTRIC_PRODUCER_SENSOR_TYPES
 )
+from .analytics import analytics_context
+from .api import RemehaHomeAPI
+from .circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity, account_device_info
+from .helpers import compile_key_path, parse_timestamp
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,48 +40,67 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the Remeha Home sensor entities from a config entry."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"]
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    entities = []
-    for appliance in coordinator.data["appliances"]:
-        appliance_id = appliance["applianceId"]
+    entities = [RemehaHomeCircuitBreakerSensor(api, coordinator, entry)]
+    for entity_description in API_METRIC_SENSOR_TYPES:
+        entities.append(
+            RemehaHomeApiMetricSensor(api, coordinator, entry, entity_description)
+        )
+    for appliance in coordinator.data:
+        appliance_id = appliance.appliance_id
         for entity_description in APPLIANCE_SENSOR_TYPES:
             entities.append(
                 RemehaHomeSensor(coordinator, appliance_id, entity_description)
             )
+        for entity_description in COP_SENSOR_TYPES:
+            entities.append(
+                RemehaHomeAnalyticsSensor(coordinator, appliance_id, entity_description)
+            )
 
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
             for entity_description in CLIMATE_ZONE_SENSOR_TYPES:
                 entities.append(
                     RemehaHomeSensor(coordinator, climate_zone_id, entity_description)
                 )
+            for entity_description in CLIMATE_ZONE_ANALYTICS_SENSOR_TYPES:
+                entities.append(
+                    RemehaHomeAnalyticsSensor(
+                        coordinator, climate_zone_id, entity_description
+                    )
+                )
 
-        for hot_water_zone in appliance["hotWaterZones"]:
-            hot_water_zone_id = hot_water_zone["hotWaterZoneId"]
+        for hot_water_zone in appliance.hot_water_zones:
+            hot_water_zone_id = hot_water_zone.hot_water_zone_id
             for entity_description in HOT_WATER_ZONE_SENSOR_TYPES:
                 entities.append(
                     RemehaHomeSensor(coordinator, hot_water_zone_id, entity_description)
                 )
-        if appliance["consumptionData"]["producerPerformanceStatistics"]:
-            if len(appliance["consumptionData"]["producerPerformanceStatistics"]["producers"]) > 1:
-                """Only add producers when more then 1"""
-                for producer in appliance["consumptionData"]["producerPerformanceStatistics"]["producers"]:
-                    producer_id ="{0}_{1}".format(appliance_id,producer["instanceWithinDevice"])
-                    if producer["energyType"] == "NaturalGas":
-                        for entity_description in GAS_PRODUCER_SENSOR_TYPES:
-                            entities.append(
-                                RemehaHomeSensor(coordinator, producer_id, entity_description)
-                            )
-                    else:
-                        for entity_description in ELECTRIC_PRODUCER_SENSOR_TYPES:
-                            entities.append(
-                                RemehaHomeSensor(coordinator, producer_id, entity_description)
-                            )
+        # Producers are only added when an appliance has more than one
+        for producer in appliance.producers:
+            producer_id = f"{appliance_id}_{producer.instance_within_device}"
+            if producer.energy_type == "NaturalGas":
+                for entity_description in GAS_PRODUCER_SENSOR_TYPES:
+                    entities.append(
+                        RemehaHomeSensor(coordinator, producer_id, entity_description)
+                    )
+            else:
+                for entity_description in ELECTRIC_PRODUCER_SENSOR_TYPES:
+                    entities.append(
+                        RemehaHomeSensor(coordinator, producer_id, entity_description)
+                    )
+                for entity_description in COP_SENSOR_TYPES:
+                    entities.append(
+                        RemehaHomeAnalyticsSensor(
+                            coordinator, producer_id, entity_description
+                        )
+                    )
     async_add_entities(entities)
 
 
-class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
+class RemehaHomeSensor(RemehaHomeEntity, SensorEntity):
     """Representation of a Sensor."""
 
     _attr_has_entity_name = True
@@ -86,10 +112,14 @@ class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
         entity_description: SensorEntityDescription,
     ) -> None:
         """Create a Remeha Home sensor entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=item_id)
         self.entity_description = entity_description
         self.item_id = item_id
         self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
+        self._get_value = compile_key_path(entity_description.key)
+        self._is_timestamp = (
+            entity_description.device_class == SensorDeviceClass.TIMESTAMP
+        )
 
     @property
     def _data(self):
@@ -99,21 +129,15 @@ class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the measurement value for this sensor."""
-        data = self._data
-        for part in self.entity_description.key.split("."):
+        try:
+            value = self._get_value(self._data)
+        except (KeyError, TypeError):
             # If the key is missing for some reason, don't crash, instead return None
-            if part not in data:
-                _LOGGER.warning(
-                    "Key not found in data: %s", self.entity_description.key
-                )
-                return None
-            data = data[part]
-        value = data
+            _LOGGER.warning("Key not found in data: %s", self.entity_description.key)
+            return None
 
-        if self.entity_description.device_class == SensorDeviceClass.TIMESTAMP:
-            return dt_util.parse_datetime(value).replace(
-                tzinfo=dt_util.DEFAULT_TIME_ZONE
-            )
+        if self._is_timestamp:
+            return parse_timestamp(value)
 
         return value
 
@@ -121,3 +145,140 @@ class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
     def device_info(self) -> DeviceInfo:
         """Return device info for this device."""
         return self.coordinator.get_device_info(self.item_id)
+
+
+class RemehaHomeAnalyticsSensor(RemehaHomeEntity, SensorEntity):
+    """Sensor with a rolling thermal analytic of a climate zone or producer."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: RemehaHomeUpdateCoordinator,
+        item_id: str,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Create a Remeha Home analytics sensor entity."""
+        super().__init__(coordinator, context=analytics_context(item_id))
+        self.entity_description = entity_description
+        self.item_id = item_id
+        self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
+        self._get_value = getattr(coordinator.analytics, entity_description.key)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value of the analytic."""
+        return self._get_value(self.item_id)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for this device."""
+        return self.coordinator.get_device_info(self.item_id)
+
+
+class RemehaHomeCircuitBreakerSensor(RemehaHomeEntity, SensorEntity):
+    """Diagnostic sensor with the state of the circuit breaker of the API.
+
+    The state is written when the circuit opens or closes and on coordinator
+    updates, which keeps the retry countdown and failure counts current.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "api_circuit_breaker"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        api: RemehaHomeAPI,
+        coordinator: RemehaHomeUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Create a Remeha Home circuit breaker sensor entity."""
+        super().__init__(coordinator)
+        self.api = api
+        self._attr_unique_id = "_".join([DOMAIN, entry.entry_id, "api_circuit_breaker"])
+        self._attr_device_info = account_device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state when the circuit breaker changes state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.api.circuit_breaker.add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the breaker state is known even when updates fail."""
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the state of the circuit breaker."""
+        return self.api.circuit_breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the failure counts of the circuit breaker."""
+        breaker = self.api.circuit_breaker
+        return {
+            "consecutive_failures": breaker.consecutive_failures,
+            "open_count": breaker.open_count,
+            "seconds_until_retry": breaker.seconds_until_retry,
+            "retries": self.api.metrics.retries,
+        }
+
+
+class RemehaHomeApiMetricSensor(RemehaHomeEntity, SensorEntity):
+    """Diagnostic sensor with a metric of the requests made to the API."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        api: RemehaHomeAPI,
+        coordinator: RemehaHomeUpdateCoordinator,
+        entry: ConfigEntry,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Create a Remeha Home API metric sensor entity."""
+        super().__init__(coordinator)
+        self.api = api
+        self.entity_description = entity_description
+        self._attr_unique_id = "_".join(
+            [DOMAIN, entry.entry_id, "api", entity_description.key]
+        )
+        self._attr_device_info = account_device_info(entry)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are known even when updates fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the value of the metric."""
+        return getattr(self.api.metrics, self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the metric for each endpoint, or the status counts for requests."""
+        endpoints = self.api.metrics.endpoints
+        key = self.entity_description.key
+        if key == "mean_latency":
+            return {
+                endpoint: round(metrics.latency_sum / metrics.requests, 3)
+                for endpoint, metrics in endpoints.items()
+            }
+        if key in ("bytes_received", "retries"):
+            return {
+                endpoint: getattr(metrics, key)
+                for endpoint, metrics in endpoints.items()
+            }
+        if key == "requests_last_hour":
+            return {
+                endpoint: dict(metrics.statuses)
+                for endpoint, metrics in endpoints.items()
+            }
+        return None
@@ -13,11 +13,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import RemehaHomeAPI
 from .const import DOMAIN
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
+from .helpers import attribute_name, compile_key_path
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,9 +31,9 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     entities = []
-    for appliance in coordinator.data["appliances"]:
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+    for appliance in coordinator.data:
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
 
             entities.append(
                 RemehaHomeFireplaceModeSwitch(api, coordinator, climate_zone_id)
@@ -41,7 +42,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class RemehaHomeSwitch(CoordinatorEntity, SwitchEntity):
+class RemehaHomeSwitch(RemehaHomeEntity, SwitchEntity):
     """Representation of a switch."""
 
     _attr_has_entity_name = True
@@ -54,10 +55,11 @@ class RemehaHomeSwitch(CoordinatorEntity, SwitchEntity):
         entity_description: SwitchEntityDescription,
     ) -> None:
         """Create a Remeha Home switch entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=climate_zone_id)
         self.api = api
         self.climate_zone_id = climate_zone_id
         self.entity_description = entity_description
+        self._get_value = compile_key_path(entity_description.key)
 
         self._attr_unique_id = "_".join(
             [DOMAIN, self.climate_zone_id, entity_description.key]
@@ -71,7 +73,7 @@ class RemehaHomeSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return the state of this switch."""
-        return self._data[self.entity_description.key]
+        return self._get_value(self._data)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -110,11 +112,17 @@ class RemehaHomeFireplaceModeSwitch(RemehaHomeSwitch):
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
         _LOGGER.debug("Enable fireplace mode")
-        await self.api.async_set_fireplace_mode(self.climate_zone_id, True)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_send_command(
+            self.climate_zone_id,
+            {attribute_name(self.entity_description.key): True},
+            self.api.async_set_fireplace_mode(self.climate_zone_id, True),
+        )
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
         _LOGGER.debug("Disable fireplace mode")
-        await self.api.async_set_fireplace_mode(self.climate_zone_id, False)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_send_command(
+            self.climate_zone_id,
+            {attribute_name(self.entity_description.key): False},
+            self.api.async_set_fireplace_mode(self.climate_zone_id, False),
+        )
@@ -0,0 +1,265 @@
+"""Record and replay of the traffic of the Remeha Home API.
+
+The recorder writes the responses to GET requests as JSON lines to a rotating
+log, with personal information removed and ids replaced by stable pseudonyms.
+The replay session serves a recording to the API client, so the coordinator can
+be profiled against the appliances of a real account without network access.
+"""
+
+from __future__ import annotations
+from collections import deque
+from collections.abc import Mapping
+import hashlib
+import hmac
+import json
+import logging
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+import queue
+import secrets
+import time
+from typing import Any
+
+import asyncio
+from aiohttp import ClientResponseError, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .const import (
+    TRAFFIC_LOG_BACKUP_COUNT,
+    TRAFFIC_LOG_MAX_BYTES,
+    TRAFFIC_PSEUDONYMIZED_KEYS,
+    TRAFFIC_RECORDED_HEADERS,
+    TRAFFIC_REDACTED_KEYS,
+)
+from .metrics import ID_COLLECTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+
+
+class _TrafficFormatter(logging.Formatter):
+    """Redact a recorded exchange and format it as a JSON line.
+
+    This runs in the thread of the queue listener, so decoding and redacting
+    large responses does not block the event loop.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """Create a formatter with the supplied key for the pseudonyms."""
+        super().__init__()
+        self._key = key
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the redacted exchange of the record."""
+        exchange = dict(record.msg)
+        exchange["path"] = self._redact_path(exchange["path"])
+        body = exchange.pop("body")
+        try:
+            exchange["body"] = self._redact(json.loads(body)) if body else None
+        except ValueError:
+            exchange["body"] = None
+        return json.dumps(exchange, separators=(",", ":"))
+
+    def _pseudonym(self, value: str) -> str:
+        """Return a pseudonym that is the same for every occurrence of a value."""
+        return hmac.new(self._key, value.encode(), hashlib.sha256).hexdigest()[:16]
+
+    def _redact_path(self, path: str) -> str:
+        """Replace the ids in the path of a request by their pseudonyms."""
+        path, separator, query = path.partition("?")
+        segments = path.split("/")
+        for index in range(1, len(segments)):
+            if segments[index - 1] in ID_COLLECTIONS and not segments[index].isdigit():
+                segments[index] = self._pseudonym(segments[index])
+        return "/".join(segments) + separator + query
+
+    def _redact(self, data: Any) -> Any:
+        """Return the data with personal values removed and ids pseudonymized."""
+        if isinstance(data, list):
+            return [self._redact(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        redacted = {}
+        for key, value in data.items():
+            if key in TRAFFIC_REDACTED_KEYS and value is not None:
+                redacted[key] = REDACTED
+            elif key in TRAFFIC_PSEUDONYMIZED_KEYS and isinstance(value, str):
+                redacted[key] = self._pseudonym(value)
+            else:
+                redacted[key] = self._redact(value)
+        return redacted
+
+
+class TrafficRecorder:
+    """Write the responses of the API to a rotating log of JSON lines.
+
+    Recording only queues the exchange, the file is written by a separate
+    thread. start and stop do blocking I/O and must run in the executor.
+
+    The key of the pseudonyms is kept in a file next to the log, so a recording
+    that spans restarts and reloads uses the same pseudonyms throughout. Only
+    the log should be shared, the key file allows recovering the ids.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Create a recorder writing to the supplied path."""
+        self.path = path
+        self.key_path = path.with_suffix(".key")
+        self._queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._listener: QueueListener | None = None
+
+    def start(self) -> None:
+        """Open the log and start writing the recorded exchanges."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            self.path,
+            maxBytes=TRAFFIC_LOG_MAX_BYTES,
+            backupCount=TRAFFIC_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        handler.setFormatter(_TrafficFormatter(self._load_key()))
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        _LOGGER.info("Recording Remeha Home API traffic to %s", self.path)
+
+    def _load_key(self) -> bytes:
+        """Return the key of the pseudonyms, creating it for a new recording."""
+        try:
+            return self.key_path.read_bytes()
+        except FileNotFoundError:
+            pass
+        key = secrets.token_bytes(16)
+        self.key_path.touch(mode=0o600)
+        self.key_path.write_bytes(key)
+        return key
+
+    def stop(self) -> None:
+        """Write the remaining exchanges and close the log."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        latency: float,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        """Queue an exchange to be redacted and written to the log."""
+        if self._listener is None:
+            return
+        self._queue.put_nowait(
+            logging.makeLogRecord(
+                {
+                    "msg": {
+                        "time": round(time.time(), 3),
+                        "method": method,
+                        "path": path,
+                        "status": status,
+                        "latency": round(latency, 3),
+                        "headers": {
+                            name: headers[name]
+                            for name in TRAFFIC_RECORDED_HEADERS
+                            if name in headers
+                        },
+                        "body": body,
+                    }
+                }
+            )
+        )
+
+
+def load_recording(path: Path) -> list[dict]:
+    """Return the exchanges of a recording, including its rotated backups."""
+    paths = [
+        path.with_name(f"{path.name}.{index}")
+        for index in range(TRAFFIC_LOG_BACKUP_COUNT, 0, -1)
+    ]
+    exchanges = []
+    for log_path in [*paths, path]:
+        if log_path.exists():
+            with log_path.open(encoding="utf-8") as log:
+                exchanges.extend(json.loads(line) for line in log if line.strip())
+    return exchanges
+
+
+class ReplayResponse:
+    """Response of a replay session, with the parts of the aiohttp API in use."""
+
+    def __init__(self, method: str, url: str, exchange: dict | None) -> None:
+        """Create a response from a recorded exchange, or an empty one without."""
+        self.method = method
+        self.url = URL(url)
+        if exchange is None:
+            self.status = 404 if method == "GET" else 200
+            self.headers = CIMultiDictProxy(CIMultiDict())
+            self._body = b""
+            return
+
+        self.status = exchange["status"]
+        self.headers = CIMultiDictProxy(CIMultiDict(exchange["headers"]))
+        self._body = (
+            b"" if exchange["body"] is None else json.dumps(exchange["body"]).encode()
+        )
+
+    async def read(self) -> bytes:
+        """Return the body of the response."""
+        return self._body
+
+    async def json(self) -> Any:
+        """Return the decoded body of the response."""
+        return json.loads(self._body)
+
+    def raise_for_status(self) -> None:
+        """Raise a ClientResponseError when the response has an error status."""
+        if self.status >= 400:
+            raise ClientResponseError(
+                RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict())),
+                (),
+                status=self.status,
+            )
+
+    def release(self) -> None:
+        """Do nothing, a replayed response holds no connection."""
+
+
+class ReplaySession:
+    """Serve recorded exchanges instead of sending requests to the API.
+
+    Requests are matched on method and path without the query. Every request
+    receives the next recorded exchange for its path, the last exchange is
+    repeated once the recording is exhausted. The recorded latency is divided
+    by the speed, a speed of zero answers immediately. Commands that were not
+    recorded succeed without changing anything.
+    """
+
+    def __init__(self, exchanges: list[dict], speed: float = 1.0) -> None:
+        """Create a replay session for the supplied exchanges."""
+        self.speed = speed
+        self._exchanges: dict[tuple[str, str], deque[dict]] = {}
+        for exchange in exchanges:
+            key = (exchange["method"], exchange["path"].partition("?")[0])
+            self._exchanges.setdefault(key, deque()).append(exchange)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> ReplayResponse:
+        """Return the next recorded response for the request.
+
+        The API client must use an empty base URL, so the URL of a request is
+        the path that was recorded.
+        """
+        exchange = None
+        if exchanges := self._exchanges.get((method, url.partition("?")[0])):
+            exchange = exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+
+        if exchange is not None and self.speed:
+            await asyncio.sleep(exchange["latency"] / self.speed)
+        return ReplayResponse(method, url, exchange)
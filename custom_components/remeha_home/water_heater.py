@@ -0,0 +1,223 @@
+"""Platform for Remeha Home water heater integration."""
+
+from __future__ import annotations
+from typing import Any
+import logging
+
+from homeassistant.components.water_heater import (
+    ATTR_OPERATION_MODE,
+    STATE_ECO,
+    WaterHeaterEntity,
+    WaterHeaterEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    PRECISION_HALVES,
+    STATE_OFF,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .api import RemehaHomeAPI
+from .const import DOMAIN
+from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
+from .models import HotWaterZone
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_SCHEDULE = "schedule"
+STATE_COMFORT = "comfort"
+
+# Only "Off" is documented for hot water zones, the other modes use the names
+# of the climate zone modes, and continuous comfort is named after its endpoint
+REMEHA_MODE_TO_OPERATION_MODE = {
+    "Scheduling": STATE_SCHEDULE,
+    "ContinuousComfort": STATE_COMFORT,
+    "FrostProtection": STATE_ECO,
+    "Off": STATE_OFF,
+}
+
+OPERATION_MODE_TO_REMEHA_MODE = {
+    STATE_SCHEDULE: "Scheduling",
+    STATE_COMFORT: "ContinuousComfort",
+    STATE_ECO: "FrostProtection",
+}
+
+# Unknown hot water zone modes that were logged already
+_logged_unknown_modes: set[str] = set()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Remeha Home water heater entity from a config entry."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    entities = []
+    for appliance in coordinator.data:
+        for hot_water_zone in appliance.hot_water_zones:
+            hot_water_zone_id = hot_water_zone.hot_water_zone_id
+            entities.append(
+                RemehaHomeWaterHeaterEntity(api, coordinator, hot_water_zone_id)
+            )
+
+    async_add_entities(entities)
+
+
+class RemehaHomeWaterHeaterEntity(RemehaHomeEntity, WaterHeaterEntity):
+    """Water heater entity representing a Remeha Home hot water zone.
+
+    The target temperature is the comfort setpoint in comfort mode, the reduced
+    setpoint in eco mode and the currently active setpoint in schedule mode.
+    """
+
+    _attr_supported_features = (
+        WaterHeaterEntityFeature.TARGET_TEMPERATURE
+        | WaterHeaterEntityFeature.OPERATION_MODE
+    )
+    _attr_operation_list = list(OPERATION_MODE_TO_REMEHA_MODE)
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_precision = PRECISION_HALVES
+    _attr_has_entity_name = True
+    _attr_name = None
+    _attr_translation_key = "remeha_home"
+
+    def __init__(
+        self,
+        api: RemehaHomeAPI,
+        coordinator: RemehaHomeUpdateCoordinator,
+        hot_water_zone_id: str,
+    ) -> None:
+        """Create a Remeha Home water heater entity."""
+        super().__init__(coordinator, context=hot_water_zone_id)
+        self.api = api
+        self.coordinator = coordinator
+        self.hot_water_zone_id = hot_water_zone_id
+
+        self._attr_unique_id = "_".join([DOMAIN, self.hot_water_zone_id])
+
+    @property
+    def _data(self) -> HotWaterZone:
+        """Return the hot water zone information from the coordinator."""
+        return self.coordinator.get_by_id(self.hot_water_zone_id)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for this device."""
+        return self.coordinator.get_device_info(self.hot_water_zone_id)
+
+    @property
+    def current_temperature(self) -> float | None:
+        """Return the current water temperature."""
+        return self._data.dhw_temperature
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return the target temperature."""
+        operation_mode = self.current_operation
+        if operation_mode == STATE_OFF:
+            return None
+        if operation_mode is None:
+            return self._data.target_setpoint
+        return getattr(self._data, self._setpoint_key(operation_mode))
+
+    @property
+    def min_temp(self) -> float:
+        """Return the minimum temperature."""
+        # Capability attributes are also written while the zone is unavailable
+        if self._data is None:
+            return super().min_temp
+        set_point_ranges = self._data.set_point_ranges
+        if self.current_operation == STATE_ECO and set_point_ranges is not None:
+            return set_point_ranges.get("reducedSetpointMin", self._data.set_point_min)
+        return self._data.set_point_min
+
+    @property
+    def max_temp(self) -> float:
+        """Return the maximum temperature."""
+        if self._data is None:
+            return super().max_temp
+        set_point_ranges = self._data.set_point_ranges
+        if self.current_operation == STATE_ECO and set_point_ranges is not None:
+            return set_point_ranges.get("reducedSetpointMax", self._data.set_point_max)
+        return self._data.set_point_max
+
+    @property
+    def current_operation(self) -> str | None:
+        """Return the current operation mode."""
+        mode = self._data.dhw_zone_mode
+        operation_mode = REMEHA_MODE_TO_OPERATION_MODE.get(mode)
+        if operation_mode is None and mode not in _logged_unknown_modes:
+            _logged_unknown_modes.add(mode)
+            _LOGGER.warning("Unknown hot water zone mode %s", mode)
+        return operation_mode
+
+    def _setpoint_key(self, operation_mode: str | None) -> str:
+        """Return the attribute name of the setpoint used in an operation mode."""
+        if operation_mode == STATE_COMFORT:
+            return "comfort_set_point"
+        if operation_mode == STATE_ECO:
+            return "reduced_setpoint"
+        # The schedule switches between the comfort and the reduced setpoint
+        if self._data.target_setpoint == self._data.reduced_setpoint:
+            return "reduced_setpoint"
+        return "comfort_set_point"
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Set the setpoint of the current or the supplied operation mode.
+
+        Setpoint changes are sent through the coordinator, so a burst of
+        changes only sends the last value and results in a single update.
+        """
+        if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
+            return
+
+        operation_mode = kwargs.get(ATTR_OPERATION_MODE)
+        if operation_mode is not None and operation_mode != self.current_operation:
+            await self.async_set_operation_mode(operation_mode)
+
+        setpoint_key = self._setpoint_key(operation_mode or self.current_operation)
+        _LOGGER.debug("Setting %s to %f", setpoint_key, temperature)
+        if setpoint_key == "comfort_set_point":
+            command = self.api.async_set_hot_water_comfort_setpoint(
+                self.hot_water_zone_id, temperature
+            )
+        else:
+            command = self.api.async_set_hot_water_reduced_setpoint(
+                self.hot_water_zone_id, temperature
+            )
+
+        await self.coordinator.async_send_command(
+            self.hot_water_zone_id,
+            {setpoint_key: temperature},
+            command,
+            coalesce=True,
+        )
+
+    async def async_set_operation_mode(self, operation_mode: str) -> None:
+        """Set new operation mode."""
+        _LOGGER.debug("Setting operation mode to %s", operation_mode)
+
+        if operation_mode == STATE_SCHEDULE:
+            command = self.api.async_set_hot_water_schedule(self.hot_water_zone_id)
+        elif operation_mode == STATE_COMFORT:
+            command = self.api.async_set_hot_water_continuous_comfort(
+                self.hot_water_zone_id
+            )
+        elif operation_mode == STATE_ECO:
+            command = self.api.async_set_hot_water_anti_frost(self.hot_water_zone_id)
+        else:
+            raise NotImplementedError()
+
+        await self.coordinator.async_send_command(
+            self.hot_water_zone_id,
+            {"dhw_zone_mode": OPERATION_MODE_TO_REMEHA_MODE[operation_mode]},
+            command,
+        )
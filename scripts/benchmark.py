@@ -0,0 +1,280 @@
+"""Benchmark the Remeha Home integration against the local mock cloud.
+
+Drives the update coordinator and the entity platforms through a number of
+refresh cycles and reports refresh latency, memory allocations, entity updates
+and the API calls made per endpoint.
+
+Requires the development environment from scripts/setup, for example:
+`python3 scripts/benchmark.py --appliances 20 --climate-zones 3 --latency 0.1`
+"""
+
+from __future__ import annotations
+import argparse
+from functools import partial
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+
+import asyncio
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from mock_cloud import API_PREFIX, TOKEN_PATH, add_arguments, from_arguments  # noqa: E402
+from remeha_home import (  # noqa: E402
+    binary_sensor,
+    calendar,
+    climate,
+    sensor,
+    switch,
+    water_heater,
+)
+from remeha_home.api import RemehaHomeAPI  # noqa: E402
+from remeha_home.const import (  # noqa: E402
+    CONF_CONDITIONAL_DASHBOARD,
+    CONF_MAX_PARALLEL_REQUESTS,
+    DEFAULT_MAX_PARALLEL_REQUESTS,
+    DOMAIN,
+)
+from remeha_home.coordinator import RemehaHomeUpdateCoordinator  # noqa: E402
+
+# The entity properties read when Home Assistant writes the state of an entity
+ENTITY_PROPERTIES = {
+    binary_sensor: ("is_on",),
+    calendar: ("event",),
+    climate: (
+        "current_temperature",
+        "target_temperature",
+        "hvac_mode",
+        "hvac_action",
+        "preset_mode",
+    ),
+    sensor: ("native_value",),
+    switch: ("is_on",),
+    water_heater: ("current_temperature", "target_temperature", "current_operation"),
+}
+
+
+class BenchmarkOAuth2Session:
+    """Minimal OAuth2 session requesting tokens from the mock cloud."""
+
+    def __init__(self, session: ClientSession, token_url: str) -> None:
+        """Create a session using the supplied token endpoint."""
+        self._session = session
+        self._token_url = token_url
+        self.token: dict = {}
+
+    @property
+    def valid_token(self) -> bool:
+        """Return whether the current token is still valid."""
+        return bool(self.token) and self.token["expires_at"] > time.time()
+
+    async def async_ensure_token_valid(self) -> None:
+        """Request a new token when the current one expired."""
+        if self.valid_token:
+            return
+        async with self._session.post(self._token_url) as response:
+            response.raise_for_status()
+            token = await response.json()
+        self.token = {**token, "expires_at": time.time() + token["expires_in"]}
+
+    async def async_request(self, method: str, url: str, **kwargs):
+        """Make an authenticated request."""
+        await self.async_ensure_token_valid()
+        headers = kwargs.pop("headers", {})
+        return await self._session.request(
+            method,
+            url,
+            **kwargs,
+            headers={
+                **headers,
+                "authorization": f"Bearer {self.token['access_token']}",
+            },
+        )
+
+
+async def async_benchmark(args: argparse.Namespace) -> None:
+    """Run the benchmark and print a report."""
+    cloud = from_arguments(args)
+    runner = web.AppRunner(cloud.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = ConfigEntry(
+            data={},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={
+                CONF_MAX_PARALLEL_REQUESTS: args.max_parallel_requests,
+                CONF_CONDITIONAL_DASHBOARD: not args.unconditional,
+            },
+            source="user",
+            title="Benchmark",
+            unique_id=None,
+            version=1,
+        )
+
+        async with ClientSession() as session:
+            api = RemehaHomeAPI(
+                BenchmarkOAuth2Session(session, base_url + TOKEN_PATH),
+                base_url=base_url + API_PREFIX,
+            )
+            coordinator = RemehaHomeUpdateCoordinator(
+                hass,
+                entry,
+                api,
+                max_parallel_requests=args.max_parallel_requests,
+                conditional_dashboard=not args.unconditional,
+            )
+            hass.data[DOMAIN] = {
+                entry.entry_id: {"api": api, "coordinator": coordinator}
+            }
+
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            first_refresh = time.perf_counter() - start
+            if not coordinator.last_update_success:
+                raise SystemExit("The first refresh failed")
+
+            entity_updates = await _async_setup_entities(hass, entry, coordinator)
+            setup_calls = sum(cloud.call_counts.values())
+
+            latencies = []
+            allocations = []
+            failures = 0
+            tracemalloc.start()
+            for _ in range(args.cycles):
+                tracemalloc.reset_peak()
+                allocated_before = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                latencies.append(time.perf_counter() - start)
+                allocations.append(
+                    tracemalloc.get_traced_memory()[1] - allocated_before
+                )
+                failures += not coordinator.last_update_success
+            tracemalloc.stop()
+
+            await coordinator.async_shutdown()
+
+    await runner.cleanup()
+
+    _report(
+        args,
+        first_refresh,
+        latencies,
+        allocations,
+        failures,
+        entity_updates,
+        setup_calls,
+        cloud.call_counts,
+        cloud.status_counts,
+    )
+
+
+async def _async_setup_entities(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: RemehaHomeUpdateCoordinator
+) -> dict[str, int]:
+    """Set up the entity platforms and count how often entities are updated.
+
+    Instead of writing the state, every update reads the properties that Home
+    Assistant would read for the state of the entity.
+    """
+    entity_updates = {"entities": 0, "updates": 0}
+
+    def update_entity(entity, properties) -> None:
+        entity_updates["updates"] += 1
+        for name in properties:
+            getattr(entity, name)
+        entity.extra_state_attributes  # noqa: B018
+
+    for platform, properties in ENTITY_PROPERTIES.items():
+        entities = []
+        await platform.async_setup_entry(hass, entry, entities.extend)
+        entity_updates["entities"] += len(entities)
+        for entity in entities:
+            coordinator.async_add_listener(
+                partial(update_entity, entity, properties),
+                entity.coordinator_context,
+            )
+
+    return entity_updates
+
+
+def _report(
+    args: argparse.Namespace,
+    first_refresh: float,
+    latencies: list[float],
+    allocations: list[int],
+    failures: int,
+    entity_updates: dict[str, int],
+    setup_calls: int,
+    call_counts,
+    status_counts,
+) -> None:
+    """Write the benchmark results to stdout."""
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    lines = [
+        f"Fleet: {args.appliances} appliances, {args.climate_zones} climate zones "
+        f"and {args.hot_water_zones} hot water zones per appliance",
+        f"Entities: {entity_updates['entities']}",
+        f"First refresh: {first_refresh * 1000:.1f} ms",
+        f"Refresh cycles: {len(latencies)} ({failures} failed)",
+    ]
+    if latencies_ms:
+        lines += [
+            f"Refresh latency: min {latencies_ms[0]:.1f} ms, "
+            f"median {statistics.median(latencies_ms):.1f} ms, "
+            f"p95 {latencies_ms[int(0.95 * (len(latencies_ms) - 1))]:.1f} ms, "
+            f"max {latencies_ms[-1]:.1f} ms",
+            f"Allocated per refresh: mean "
+            f"{statistics.mean(allocations) / 1024:.1f} KiB, "
+            f"max {max(allocations) / 1024:.1f} KiB",
+            f"Entity updates per refresh: "
+            f"{entity_updates['updates'] / len(latencies):.1f}",
+        ]
+    lines += [
+        f"API calls during setup: {setup_calls}",
+        "API calls per endpoint:",
+        *(
+            f"  {count:6d}  {endpoint}"
+            for endpoint, count in sorted(call_counts.items())
+        ),
+        "Responses per status: "
+        + ", ".join(
+            f"{status}: {count}" for status, count in sorted(status_counts.items())
+        ),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument(
+        "--max-parallel-requests", type=int, default=DEFAULT_MAX_PARALLEL_REQUESTS
+    )
+    parser.add_argument(
+        "--unconditional",
+        action="store_true",
+        help="always request and process the full dashboard",
+    )
+    asyncio.run(async_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+"""Local stand-in for the Remeha Home cloud API.
+
+Implements the endpoints described in documentation/api.md together with the
+B2C token endpoint, for a generated fleet of appliances. Latency and error rates
+can be configured to measure the integration under different conditions.
+
+Run it standalone with `python3 scripts/mock_cloud.py --port 8080`, or use
+`MockRemehaCloud` from another script, like scripts/benchmark.py.
+"""
+
+from __future__ import annotations
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import random
+import secrets
+import time
+
+import asyncio
+from aiohttp import web
+
+API_PREFIX = "/Mobile/api"
+TOKEN_PATH = "/bdrb2cprod.onmicrosoft.com/oauth2/v2.0/token"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%fZ"
+
+COMFORT_DEMANDS = ["Idle", "RequestingHeat", "ProducingHeat"]
+
+
+class MockRemehaCloud:
+    """Simulated Remeha Home cloud serving a generated fleet of appliances."""
+
+    def __init__(
+        self,
+        appliances: int = 1,
+        climate_zones: int = 1,
+        hot_water_zones: int = 1,
+        producers: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        change_rate: float = 0.1,
+        etag: bool = False,
+        token_lifetime: int = 3600,
+        seed: int | None = None,
+    ) -> None:
+        """Create a mock cloud with the supplied fleet size and behaviour."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.change_rate = change_rate
+        self.etag = etag
+        self.token_lifetime = token_lifetime
+        self.call_counts: Counter[str] = Counter()
+        self.status_counts: Counter[int] = Counter()
+        self._random = random.Random(seed)
+        self._tokens: dict[str, float] = {}
+
+        self.appliances = [
+            self._create_appliance(index, climate_zones, hot_water_zones, producers)
+            for index in range(appliances)
+        ]
+        self._appliances_by_id = {
+            appliance["applianceId"]: appliance for appliance in self.appliances
+        }
+        self._climate_zones = {
+            zone["climateZoneId"]: zone
+            for appliance in self.appliances
+            for zone in appliance["climateZones"]
+        }
+        self._hot_water_zones = {
+            zone["hotWaterZoneId"]: zone
+            for appliance in self.appliances
+            for zone in appliance["hotWaterZones"]
+        }
+
+    def _create_appliance(
+        self, index: int, climate_zones: int, hot_water_zones: int, producers: bool
+    ) -> dict:
+        """Generate the dashboard information of a single appliance."""
+        appliance_id = f"appliance-{index:04d}"
+        next_switch_time = (
+            datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            + timedelta(minutes=self._random.randint(5, 600))
+        ).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        return {
+            "applianceId": appliance_id,
+            "applianceOnline": True,
+            "applianceConnectionStatus": "Connected",
+            "applianceType": "Boiler",
+            "pairingStatus": "Paired",
+            "houseName": f"Home {index}",
+            "errorStatus": "Running",
+            "activeThermalMode": "Idle",
+            "operatingMode": "AutomaticHeating",
+            "outdoorTemperatureInformation": {
+                "outdoorTemperatureSource": "None",
+                "internetOutdoorTemperature": None,
+                "applianceOutdoorTemperature": None,
+                "utilizeOutdoorTemperature": None,
+                "internetOutdoorTemperatureExpected": False,
+                "isDayTime": True,
+                "weatherCode": "light fog",
+                "cloudOutdoorTemperature": -2,
+                "cloudOutdoorTemperatureStatus": "Ok",
+            },
+            "currentTimestamp": None,
+            "holidaySchedule": {
+                "startTime": "0001-01-01T00:00:00Z",
+                "endTime": "0001-01-01T00:00:00Z",
+                "active": False,
+            },
+            "autoFillingMode": "Disabled",
+            "autoFilling": {"mode": "Disabled", "status": "Standby"},
+            "waterPressure": 1.4,
+            "waterPressureOK": True,
+            "capabilityEnergyConsumption": True,
+            "capabilityCooling": False,
+            "capabilityPreHeat": True,
+            "capabilityMultiSchedule": True,
+            "capabilityPowerSettings": False,
+            "capabilityOutdoorTemperature": True,
+            "capabilityUtilizeOutdoorTemperature": False,
+            "capabilityInternetOutdoorTemperatureExpected": True,
+            "hasOverwrittenActivityNames": True,
+            "gasCalorificValue": 10.8134,
+            "isActive": True,
+            "hotWaterZones": [
+                {
+                    "hotWaterZoneId": f"{appliance_id}-dhw-{zone_index}",
+                    "applianceId": appliance_id,
+                    "name": "DHW",
+                    "zoneType": "DHW",
+                    "dhwZoneMode": "Off",
+                    "dhwStatus": "Idle",
+                    "dhwType": "Combi",
+                    "nextSwitchActivity": "Reduced",
+                    "capabilityBoostMode": True,
+                    "dhwTemperature": 52.0,
+                    "targetSetpoint": 60.0,
+                    "reducedSetpoint": 15.0,
+                    "comfortSetPoint": 60.0,
+                    "setPointMin": 40.0,
+                    "setPointMax": 65.0,
+                    "setPointRanges": {
+                        "comfortSetpointMin": 40.0,
+                        "comfortSetpointMax": 65.0,
+                        "reducedSetpointMin": 10.0,
+                        "reducedSetpointMax": 60.0,
+                    },
+                    "boostDuration": None,
+                    "boostModeEndTime": None,
+                    "nextSwitchTime": next_switch_time,
+                    "activeDwhTimeProgramNumber": 1,
+                }
+                for zone_index in range(hot_water_zones)
+            ],
+            "climateZones": [
+                {
+                    "climateZoneId": f"{appliance_id}-ch-{zone_index}",
+                    "applianceId": appliance_id,
+                    "name": f"Zone {zone_index}",
+                    "zoneIcon": 3,
+                    "zoneType": "CH",
+                    "activeComfortDemand": "Idle",
+                    "zoneMode": "Scheduling",
+                    "controlStrategy": "Automatic",
+                    "firePlaceModeActive": False,
+                    "capabilityFirePlaceMode": True,
+                    "roomTemperature": 19.5,
+                    "setPoint": 19.0,
+                    "nextSetpoint": 16.0,
+                    "nextSwitchTime": next_switch_time,
+                    "setPointMin": 5.0,
+                    "setPointMax": 30.0,
+                    "currentScheduleSetPoint": 19.0,
+                    "activeHeatingClimateTimeProgramNumber": 1,
+                    "capabilityCooling": False,
+                    "capabilityTemporaryOverrideEndTime": True,
+                    "preHeat": {"enabled": False, "active": False},
+                    "temporaryOverride": {"endTime": "0001-01-01T00:00:00Z"},
+                }
+                for zone_index in range(climate_zones)
+            ],
+            "solarThermals": [],
+            # Not part of the dashboard, removed before it is sent
+            "_producers": producers and index % 2 == 1,
+        }
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application serving the mock cloud."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post(TOKEN_PATH, self._handle_token)
+        app.router.add_get(API_PREFIX + "/homes/dashboard", self._handle_dashboard)
+        app.router.add_get(
+            API_PREFIX + "/appliances/{appliance_id}/technicaldetails",
+            self._handle_technical_details,
+        )
+        app.router.add_get(
+            API_PREFIX + "/appliances/{appliance_id}/energyconsumption/{period}",
+            self._handle_energy_consumption,
+        )
+        app.router.add_post(
+            API_PREFIX + "/climate-zones/{zone_id}/modes/{mode}",
+            self._handle_climate_zone_mode,
+        )
+        app.router.add_post(
+            API_PREFIX
+            + "/climate-zones/{zone_id}/time-programs/heating/{program_id}/activate",
+            self._handle_activate_time_program,
+        )
+        app.router.add_post(
+            API_PREFIX + "/hot-water-zones/{zone_id}/modes/{mode}",
+            self._handle_hot_water_zone_mode,
+        )
+        app.router.add_post(
+            API_PREFIX + "/hot-water-zones/{zone_id}/{setpoint}",
+            self._handle_hot_water_zone_setpoint,
+        )
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests and apply the configured latency, errors and auth."""
+        resource = request.match_info.route.resource
+        self.call_counts[
+            f"{request.method} {resource.canonical if resource else request.path}"
+        ] += 1
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(
+                max(0.0, self._random.gauss(self.latency, self.jitter))
+            )
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            response = web.json_response({"error": "Simulated failure"}, status=503)
+        elif request.path != TOKEN_PATH and not self._authorized(request):
+            response = web.json_response({"error": "Unauthorized"}, status=401)
+        else:
+            response = await handler(request)
+
+        self.status_counts[response.status] += 1
+        return response
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Return whether the request carries a valid access token."""
+        authorization = request.headers.get("Authorization", "")
+        expires_at = self._tokens.get(authorization.removeprefix("Bearer "))
+        return expires_at is not None and expires_at > time.time()
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue a new access token for any grant."""
+        access_token = secrets.token_urlsafe(32)
+        self._tokens[access_token] = time.time() + self.token_lifetime
+        return web.json_response(
+            {
+                "access_token": access_token,
+                "refresh_token": secrets.token_urlsafe(32),
+                "token_type": "Bearer",
+                "expires_in": self.token_lifetime,
+            }
+        )
+
+    async def _handle_dashboard(self, request: web.Request) -> web.Response:
+        """Return the dashboard, after simulating changes in some zones."""
+        for zone in self._climate_zones.values():
+            if self._random.random() < self.change_rate:
+                zone["roomTemperature"] = round(
+                    zone["roomTemperature"] + self._random.choice([-0.1, 0.1]), 1
+                )
+                zone["activeComfortDemand"] = self._random.choice(COMFORT_DEMANDS)
+
+        body = json.dumps(
+            {
+                "appliances": [
+                    {
+                        key: value
+                        for key, value in appliance.items()
+                        if not key.startswith("_")
+                    }
+                    for appliance in self.appliances
+                ]
+            }
+        )
+        headers = {}
+        if self.etag:
+            etag = '"' + hashlib.sha256(body.encode()).hexdigest()[:16] + '"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+
+        return web.Response(
+            text=body, content_type="application/json", headers=headers
+        )
+
+    async def _handle_technical_details(self, request: web.Request) -> web.Response:
+        """Return the technical information of an appliance."""
+        if request.match_info["appliance_id"] not in self._appliances_by_id:
+            raise web.HTTPNotFound
+
+        return web.json_response(
+            {
+                "applianceName": "Calenta Ace",
+                "internetConnectedGateways": [
+                    {
+                        "name": "eTwist",
+                        "hardwareVersion": "1.0",
+                        "softwareVersion": "2.0",
+                    }
+                ],
+            }
+        )
+
+    async def _handle_energy_consumption(self, request: web.Request) -> web.Response:
+        """Return generated consumption data for the requested period."""
+        appliance = self._appliances_by_id.get(request.match_info["appliance_id"])
+        period = request.match_info["period"]
+        if appliance is None or period not in ("daily", "monthly", "yearly"):
+            raise web.HTTPNotFound
+
+        try:
+            start = datetime.strptime(request.query["startDate"], DATE_FORMAT)
+            end = datetime.strptime(request.query["endDate"], DATE_FORMAT)
+        except (KeyError, ValueError) as err:
+            raise web.HTTPBadRequest from err
+
+        data = []
+        timestamp = _period_start(start, period)
+        while timestamp <= end and len(data) < 10000:
+            data.append(self._consumption_entry(appliance, timestamp, period))
+            timestamp = _next_period(timestamp, period)
+
+        return web.json_response(
+            {
+                "startDateTimeUsed": start.isoformat() + "+00:00",
+                "endDateTimeUsed": end.isoformat() + "+00:00",
+                "data": data,
+            }
+        )
+
+    def _consumption_entry(
+        self, appliance: dict, timestamp: datetime, period: str
+    ) -> dict:
+        """Generate the consumption of an appliance during a single period."""
+        scale = {"daily": 1, "monthly": 30, "yearly": 365}[period]
+        rng = random.Random(f"{appliance['applianceId']}{timestamp.isoformat()}")
+        heating = round(rng.uniform(5, 30) * scale, 2)
+        hot_water = round(rng.uniform(1, 5) * scale, 2)
+
+        producers = []
+        if appliance["_producers"]:
+            producers = [
+                {
+                    "isMigratedFromLegacy": False,
+                    "instanceWithinDevice": 1,
+                    "deviceIndex": "a3b5c3",
+                    "producerType": "HeatPumpAirSource",
+                    "energyType": "Electric",
+                    "energyConsumptionCH": round(heating / 3, 2),
+                    "energyConsumptionDHW": 0,
+                    "energyConsumptionCooling": 0,
+                    "energyConsumptionTotal": round(heating / 3, 2),
+                    "energyProductionCH": heating,
+                    "energyProductionDHW": 0,
+                    "energyProductionCooling": 0,
+                    "energyProductionTotal": heating,
+                    "seasonalEfficiency": None,
+                },
+                {
+                    "isMigratedFromLegacy": False,
+                    "instanceWithinDevice": 2,
+                    "deviceIndex": "b7e4f9",
+                    "producerType": "GasBoiler",
+                    "energyType": "NaturalGas",
+                    "energyConsumptionCH": hot_water,
+                    "energyConsumptionDHW": 0,
+                    "energyConsumptionCooling": 0,
+                    "energyConsumptionTotal": hot_water,
+                    "energyProductionCH": 0,
+                    "energyProductionDHW": 0,
+                    "energyProductionCooling": 0,
+                    "energyProductionTotal": 0,
+                    "seasonalEfficiency": None,
+                },
+            ]
+
+        return {
+            "timeStamp": timestamp.isoformat() + "+00:00",
+            "heatingEnergyConsumed": heating,
+            "hotWaterEnergyConsumed": hot_water,
+            "coolingEnergyConsumed": 0,
+            "heatingEnergyDelivered": 0,
+            "hotWaterEnergyDelivered": 0,
+            "coolingEnergyDelivered": 0,
+            "producerPerformanceStatistics": {"producers": producers},
+        }
+
+    async def _handle_climate_zone_mode(self, request: web.Request) -> web.Response:
+        """Change the mode of a climate zone."""
+        zone = self._climate_zones.get(request.match_info["zone_id"])
+        mode = request.match_info["mode"]
+        if zone is None:
+            raise web.HTTPNotFound
+
+        body = await request.json() if request.can_read_body else {}
+        if mode == "manual":
+            zone["zoneMode"] = "Manual"
+            zone["setPoint"] = body["roomTemperatureSetPoint"]
+        elif mode == "temporary-override":
+            zone["zoneMode"] = "TemporaryOverride"
+            zone["setPoint"] = body["roomTemperatureSetPoint"]
+        elif mode == "schedule":
+            zone["zoneMode"] = "Scheduling"
+            zone["setPoint"] = zone["currentScheduleSetPoint"]
+        elif mode == "anti-frost":
+            zone["zoneMode"] = "FrostProtection"
+        elif mode == "fireplacemode":
+            zone["firePlaceModeActive"] = body["fireplaceModeActive"]
+        else:
+            raise web.HTTPNotFound
+
+        return web.Response()
+
+    async def _handle_activate_time_program(
+        self, request: web.Request
+    ) -> web.Response:
+        """Activate a heating time program of a climate zone."""
+        zone = self._climate_zones.get(request.match_info["zone_id"])
+        if zone is None:
+            raise web.HTTPNotFound
+
+        zone["activeHeatingClimateTimeProgramNumber"] = int(
+            request.match_info["program_id"]
+        )
+        return web.Response()
+
+    async def _handle_hot_water_zone_mode(self, request: web.Request) -> web.Response:
+        """Change the mode of a hot water zone."""
+        zone = self._hot_water_zones.get(request.match_info["zone_id"])
+        # Only "Off" is documented, the other names follow the climate zones
+        modes = {
+            "anti-frost": "FrostProtection",
+            "schedule": "Scheduling",
+            "continuous-comfort": "ContinuousComfort",
+        }
+        if zone is None or request.match_info["mode"] not in modes:
+            raise web.HTTPNotFound
+
+        zone["dhwZoneMode"] = modes[request.match_info["mode"]]
+        return web.Response()
+
+    async def _handle_hot_water_zone_setpoint(
+        self, request: web.Request
+    ) -> web.Response:
+        """Change the comfort or reduced setpoint of a hot water zone."""
+        zone = self._hot_water_zones.get(request.match_info["zone_id"])
+        setpoint = request.match_info["setpoint"]
+        if zone is None or setpoint not in ("comfort-setpoint", "reduced-setpoint"):
+            raise web.HTTPNotFound
+
+        body = await request.json()
+        if setpoint == "comfort-setpoint":
+            zone["comfortSetPoint"] = body["comfortSetpoint"]
+        else:
+            zone["reducedSetpoint"] = body["reducedSetpoint"]
+        return web.Response()
+
+
+def _period_start(timestamp: datetime, period: str) -> datetime:
+    """Return the start of the period containing the timestamp."""
+    timestamp = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "monthly":
+        return timestamp.replace(day=1)
+    if period == "yearly":
+        return timestamp.replace(month=1, day=1)
+    return timestamp
+
+
+def _next_period(timestamp: datetime, period: str) -> datetime:
+    """Return the start of the period following the timestamp."""
+    if period == "daily":
+        return timestamp + timedelta(days=1)
+    if period == "monthly":
+        return (timestamp + timedelta(days=32)).replace(day=1)
+    return timestamp.replace(year=timestamp.year + 1)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock cloud options to an argument parser."""
+    parser.add_argument("--appliances", type=int, default=1)
+    parser.add_argument("--climate-zones", type=int, default=1)
+    parser.add_argument("--hot-water-zones", type=int, default=1)
+    parser.add_argument(
+        "--producers",
+        action="store_true",
+        help="give every other appliance an electric and a gas producer",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mean latency in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="latency deviation in seconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of failing requests"
+    )
+    parser.add_argument(
+        "--change-rate",
+        type=float,
+        default=0.1,
+        help="fraction of climate zones changing per dashboard request",
+    )
+    parser.add_argument(
+        "--etag", action="store_true", help="support conditional dashboard requests"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def from_arguments(args: argparse.Namespace) -> MockRemehaCloud:
+    """Create a mock cloud from parsed command line arguments."""
+    return MockRemehaCloud(
+        appliances=args.appliances,
+        climate_zones=args.climate_zones,
+        hot_water_zones=args.hot_water_zones,
+        producers=args.producers,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        change_rate=args.change_rate,
+        etag=args.etag,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Serve the mock cloud until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(from_arguments(args).create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Replay recorded Remeha Home API traffic through the integration.
+
+Drives the update coordinator and the entity platforms with the exchanges that
+were recorded using the "record traffic" option, so the processing of a real
+account can be measured and profiled without network access. Every recorded
+dashboard is one refresh cycle, run after the recorded time between dashboards
+divided by the speed.
+
+Requires the development environment from scripts/setup, for example:
+`python3 scripts/replay.py config/remeha_home/traffic_<entry_id>.jsonl --speed 0`
+"""
+
+from __future__ import annotations
+import argparse
+import cProfile
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+
+import asyncio
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmark import _async_setup_entities  # noqa: E402
+from remeha_home.api import RemehaHomeAPI  # noqa: E402
+from remeha_home.const import DOMAIN  # noqa: E402
+from remeha_home.coordinator import RemehaHomeUpdateCoordinator  # noqa: E402
+from remeha_home.traffic import ReplaySession, load_recording  # noqa: E402
+
+
+async def async_replay(args: argparse.Namespace) -> None:
+    """Replay the recording and print a report."""
+    exchanges = load_recording(args.recording)
+    dashboard_times = [
+        exchange["time"]
+        for exchange in exchanges
+        if exchange["path"].startswith("/homes/dashboard")
+    ]
+    if not dashboard_times:
+        raise SystemExit("The recording contains no dashboard")
+
+    profiler = cProfile.Profile() if args.profile else None
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = ConfigEntry(
+            data={},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source="user",
+            title="Replay",
+            unique_id=None,
+            version=1,
+        )
+        # The recorded paths are relative to the base URL of the API
+        api = RemehaHomeAPI(
+            base_url="", session=ReplaySession(exchanges, speed=args.speed)
+        )
+        coordinator = RemehaHomeUpdateCoordinator(hass, entry, api)
+        hass.data[DOMAIN] = {entry.entry_id: {"api": api, "coordinator": coordinator}}
+
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise SystemExit("The first refresh failed")
+        entity_updates = await _async_setup_entities(hass, entry, coordinator)
+
+        latencies = []
+        for previous, current in zip(dashboard_times, dashboard_times[1:]):
+            if args.speed:
+                await asyncio.sleep(max(current - previous, 0) / args.speed)
+            if profiler is not None:
+                profiler.enable()
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - start)
+            if profiler is not None:
+                profiler.disable()
+
+        await coordinator.async_shutdown()
+
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    lines = [
+        f"Recorded exchanges: {len(exchanges)}",
+        f"Appliances: {len(coordinator.data)}",
+        f"Entities: {entity_updates['entities']}",
+        f"Refresh cycles: {len(latencies)}",
+    ]
+    if latencies_ms:
+        lines += [
+            f"Refresh latency: min {latencies_ms[0]:.1f} ms, "
+            f"median {statistics.median(latencies_ms):.1f} ms, "
+            f"max {latencies_ms[-1]:.1f} ms",
+            f"Entity updates per refresh: "
+            f"{entity_updates['updates'] / len(latencies):.1f}",
+        ]
+    lines += [
+        "API calls per endpoint:",
+        *(
+            f"  {metrics.requests:6d}  {endpoint}"
+            for endpoint, metrics in sorted(api.metrics.endpoints.items())
+        ),
+    ]
+    if profiler is not None:
+        lines.append(f"Profile written to {args.profile}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    """Parse the command line and replay the recording."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", type=Path)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="divide the recorded timing by this factor, 0 replays without delays",
+    )
+    parser.add_argument(
+        "--profile", type=Path, help="write a cProfile of the refresh cycles here"
+    )
+    asyncio.run(async_replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Tests for the selection of the requested consumption day."""
+
+from datetime import datetime
+import importlib.util
+from pathlib import Path
+
+# The module does not depend on Home Assistant, so it is loaded on its own
+_SPEC = importlib.util.spec_from_file_location(
+    "consumption",
+    Path(__file__).parents[1] / "custom_components/remeha_home/consumption.py",
+)
+consumption = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(consumption)
+
+
+def test_first_request_covers_today():
+    """Without a previous request the consumption of today is requested."""
+    start, end = consumption.consumption_period(None, datetime(2023, 1, 3, 0, 5))
+
+    assert start == datetime(2023, 1, 3)
+    assert end == datetime(2023, 1, 3, 23, 59, 59)
+
+
+def test_requests_during_the_day_cover_today():
+    """Every request during the day covers the whole day."""
+    start, end = consumption.consumption_period(
+        datetime(2023, 1, 3, 14, 0), datetime(2023, 1, 3, 14, 15)
+    )
+
+    assert start == datetime(2023, 1, 3)
+    assert end == datetime(2023, 1, 3, 23, 59, 59)
+
+
+def test_rollover_completes_the_previous_day():
+    """The first request after midnight completes yesterday, the next is today."""
+    last_request_yesterday = datetime(2023, 1, 2, 23, 50)
+    first_request_today = datetime(2023, 1, 3, 0, 5)
+
+    start, end = consumption.consumption_period(
+        last_request_yesterday, first_request_today
+    )
+    assert start == datetime(2023, 1, 2)
+    assert end == datetime(2023, 1, 2, 23, 59, 59)
+
+    start, end = consumption.consumption_period(
+        first_request_today, datetime(2023, 1, 3, 0, 20)
+    )
+    assert start == datetime(2023, 1, 3)
+
+
+def test_older_previous_request_is_not_completed():
+    """After an outage of more than a day only today is requested."""
+    start, _ = consumption.consumption_period(
+        datetime(2022, 12, 30, 12, 0), datetime(2023, 1, 3, 0, 5)
+    )
+
+    assert start == datetime(2023, 1, 3)
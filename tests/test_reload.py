@@ -0,0 +1,47 @@
+"""Tests for reloading a config entry after its options changed."""
+
+import asyncio
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from custom_components.remeha_home import async_reload_entry  # noqa: E402
+from custom_components.remeha_home.const import DOMAIN  # noqa: E402
+
+
+def _hass(options: dict) -> SimpleNamespace:
+    """Return a minimal Home Assistant with an entry set up with the options."""
+    return SimpleNamespace(
+        data={DOMAIN: {"entry": {"options": dict(options)}}},
+        config_entries=SimpleNamespace(async_reload=AsyncMock()),
+    )
+
+
+def test_token_update_does_not_reload():
+    """A changed token in the entry data does not reload the entry."""
+    hass = _hass({"update_interval": 60})
+    entry = SimpleNamespace(
+        entry_id="entry",
+        options={"update_interval": 60},
+        data={"token": {"access_token": "new"}},
+    )
+
+    asyncio.run(async_reload_entry(hass, entry))
+
+    hass.config_entries.async_reload.assert_not_called()
+
+
+def test_options_update_reloads():
+    """Changed options reload the entry."""
+    hass = _hass({"update_interval": 60})
+    entry = SimpleNamespace(entry_id="entry", options={"update_interval": 30})
+
+    asyncio.run(async_reload_entry(hass, entry))
+
+    hass.config_entries.async_reload.assert_awaited_once_with("entry")